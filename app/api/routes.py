@@ -1,12 +1,23 @@
 """
 API Routes - All endpoint definitions with authentication support
 Handles HTTP requests and returns responses
+
+Project rule: handlers are async def for auth/DB awaits only - never run
+sync CPU work (regex, TextBlob, tokenization) directly in a handler; wrap
+it in run_in_threadpool so the event loop stays free.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+import orjson
+from typing import Any, Optional, Tuple
+import hashlib
 import logging
 
+from cachetools import TTLCache
+
 from app.models.schemas import (
     TextAnalysisRequest, TextAnalysisResponse,
     LegalAnalysisRequest, LegalAnalysisResponse,
@@ -14,10 +25,11 @@ from app.models.schemas import (
     BatchAnalysisRequest, BatchAnalysisResponse,
     DocumentComparisonRequest, DocumentComparisonResponse,
     HealthCheckResponse, ErrorResponse,
-    UserStatsResponse, UserStats
+    UserStatsResponse, UserStats, UserHistoryResponse
 )
 from app.services.analysis_service import AnalysisService
 from app.services.database_service import DatabaseService
+from app.services.save_queue import save_queue
 from app.core.config import get_settings
 from app.core.auth import get_current_user, get_current_user_optional
 
@@ -27,9 +39,24 @@ settings = get_settings()
 # Create router
 router = APIRouter()
 
-# Initialize services
-analysis_service = AnalysisService()
-db_service = DatabaseService()
+# Exact-match result cache: analyses are pure functions of their input text,
+# so repeat submissions of identical content skip the NLP pipeline entirely
+_analysis_cache: TTLCache = TTLCache(maxsize=20_000, ttl=3600)
+
+
+def _analysis_cache_key(kind: str, text: str, extra: Any = None) -> Tuple:
+    """Build a cache key from the analysis kind and a digest of the text"""
+    digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    return (kind, digest, extra)
+
+def get_analysis_service(request: Request) -> AnalysisService:
+    """Dependency: the per-worker AnalysisService created in the app lifespan"""
+    return request.app.state.analysis_service
+
+
+def get_db_service(request: Request) -> DatabaseService:
+    """Dependency: the per-worker DatabaseService created in the app lifespan"""
+    return request.app.state.db_service
 
 
 # ==================== HEALTH CHECK ====================
@@ -40,7 +67,7 @@ db_service = DatabaseService()
     tags=["Health"],
     summary="Health check endpoint"
 )
-async def health_check():
+async def health_check(db_service: DatabaseService = Depends(get_db_service)):
     """
     Check API health status.
     """
@@ -60,6 +87,7 @@ async def health_check():
 @router.post(
     "/analyze/text",
     response_model=TextAnalysisResponse,
+    response_model_exclude_none=True,
     tags=["Analysis"],
     summary="Analyze text content",
     responses={
@@ -70,7 +98,9 @@ async def health_check():
 )
 async def analyze_text(
     request: TextAnalysisRequest,
-    current_user: Optional[dict] = Depends(get_current_user_optional)
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+    db_service: DatabaseService = Depends(get_db_service)
 ):
     """
     Perform comprehensive text analysis including:
@@ -84,43 +114,50 @@ async def analyze_text(
     - Not logged in: Analysis not saved
     """
     try:
-        logger.info(f"Text analysis requested: {len(request.text)} characters, user={'authenticated' if current_user else 'anonymous'}")
-        
-        # Perform analysis
-        result = analysis_service.analyze_text(request.text)
+        # Touch the (potentially large) request text once up front
+        text = request.text
+        text_len = len(text)
+        preview = text[:200]
+
+        logger.info("Text analysis requested: %d characters, user=%s", text_len, "authenticated" if current_user else "anonymous")
+
+        # Perform analysis off the event loop (regex/TextBlob work is CPU-bound),
+        # reusing a cached result for identical input text
+        cache_key = _analysis_cache_key("text", text)
+        result = _analysis_cache.get(cache_key)
+        if result is None:
+            result = await run_in_threadpool(analysis_service.analyze_text, text)
+            _analysis_cache[cache_key] = result
         
-        # Save to database if user is authenticated
+        # Queue the save for batched background persistence
         if current_user and db_service.db_available:
-            try:
-                await db_service.save_analysis(
-                    user_id=current_user["id"],
-                    analysis_type="text",
-                    document_type=None,
-                    text_preview=request.text[:200],
-                    results=result
-                )
-                logger.info(f"Analysis saved for user {current_user['id']}")
-            except Exception as db_error:
-                logger.warning(f"Failed to save analysis: {db_error}")
+            save_queue.enqueue({
+                "user_id": current_user["id"],
+                "analysis_type": "text",
+                "document_type": None,
+                "text_preview": preview,
+                "results": result
+            })
         
-        return TextAnalysisResponse(
+        # model_construct skips re-validation of values the service
+        # already built against these same schemas
+        return TextAnalysisResponse.model_construct(
             success=True,
             message="Text analysis completed successfully",
             **result
         )
     
     except ValueError as e:
-        logger.error(f"Validation error in text analysis: {str(e)}")
+        logger.error("Validation error in text analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in text analysis: {str(e)}")
+        logger.error("Error in text analysis: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Text analysis failed"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Text analysis failed"
+        ) from e
 
 
 # ==================== LEGAL ANALYSIS ====================
@@ -128,6 +165,7 @@ async def analyze_text(
 @router.post(
     "/analyze/legal",
     response_model=LegalAnalysisResponse,
+    response_model_exclude_none=True,
     tags=["Analysis"],
     summary="Analyze legal document",
     responses={
@@ -138,7 +176,9 @@ async def analyze_text(
 )
 async def analyze_legal_document(
     request: LegalAnalysisRequest,
-    current_user: Optional[dict] = Depends(get_current_user_optional)
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+    db_service: DatabaseService = Depends(get_db_service)
 ):
     """
     Perform comprehensive legal document analysis including:
@@ -155,46 +195,52 @@ async def analyze_legal_document(
     - Not logged in: Analysis not saved
     """
     try:
-        logger.info(f"Legal analysis requested: {len(request.text)} characters, type={request.document_type}, user={'authenticated' if current_user else 'anonymous'}")
-        
-        # Perform legal analysis
-        result = analysis_service.analyze_legal_document(
-            text=request.text,
-            document_type=request.document_type
-        )
+        # Touch the (potentially large) request text once up front
+        text = request.text
+        text_len = len(text)
+        preview = text[:200]
+
+        logger.info("Legal analysis requested: %d characters, type=%s, user=%s", text_len, request.document_type, "authenticated" if current_user else "anonymous")
+
+        # Perform legal analysis off the event loop,
+        # reusing a cached result for identical input text
+        cache_key = _analysis_cache_key("legal", text, request.document_type)
+        result = _analysis_cache.get(cache_key)
+        if result is None:
+            result = await run_in_threadpool(
+                analysis_service.analyze_legal_document,
+                text=text,
+                document_type=request.document_type
+            )
+            _analysis_cache[cache_key] = result
         
-        # Save to database if user is authenticated
+        # Queue the save for batched background persistence
         if current_user and db_service.db_available:
-            try:
-                await db_service.save_analysis(
-                    user_id=current_user["id"],
-                    analysis_type="legal",
-                    document_type=request.document_type,
-                    text_preview=request.text[:200],
-                    results=result
-                )
-                logger.info(f"Legal analysis saved for user {current_user['id']}")
-            except Exception as db_error:
-                logger.warning(f"Failed to save analysis: {db_error}")
+            save_queue.enqueue({
+                "user_id": current_user["id"],
+                "analysis_type": "legal",
+                "document_type": request.document_type,
+                "text_preview": preview,
+                "results": result
+            })
         
-        return LegalAnalysisResponse(
+        return LegalAnalysisResponse.model_construct(
             success=True,
             message="Legal analysis completed successfully",
             **result
         )
     
     except ValueError as e:
-        logger.error(f"Validation error in legal analysis: {str(e)}")
+        logger.error("Validation error in legal analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in legal analysis: {str(e)}")
+        logger.error("Error in legal analysis: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Legal analysis failed"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Legal analysis failed"
+        ) from e
 
 
 # ==================== FEEDBACK ANALYSIS ====================
@@ -202,6 +248,7 @@ async def analyze_legal_document(
 @router.post(
     "/analyze/feedback",
     response_model=FeedbackAnalysisResponse,
+    response_model_exclude_none=True,
     tags=["Analysis"],
     summary="Analyze feedback or reviews",
     responses={
@@ -212,7 +259,9 @@ async def analyze_legal_document(
 )
 async def analyze_feedback(
     request: FeedbackAnalysisRequest,
-    current_user: Optional[dict] = Depends(get_current_user_optional)
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+    db_service: DatabaseService = Depends(get_db_service)
 ):
     """
     Analyze feedback, reviews, or customer comments focusing on:
@@ -223,60 +272,66 @@ async def analyze_feedback(
     **Authentication:** Optional - Works with or without login
     """
     try:
-        logger.info(f"Feedback analysis requested: {len(request.text)} characters, user={'authenticated' if current_user else 'anonymous'}")
-        
-        # Perform feedback analysis
-        result = analysis_service.analyze_feedback(request.text)
+        # Touch the (potentially large) request text once up front
+        text = request.text
+        text_len = len(text)
+        preview = text[:200]
+
+        logger.info("Feedback analysis requested: %d characters, user=%s", text_len, "authenticated" if current_user else "anonymous")
+
+        # Perform feedback analysis off the event loop,
+        # reusing a cached result for identical input text
+        cache_key = _analysis_cache_key("feedback", text)
+        result = _analysis_cache.get(cache_key)
+        if result is None:
+            result = await run_in_threadpool(analysis_service.analyze_feedback, text)
+            _analysis_cache[cache_key] = result
         
-        # Save to database if user is authenticated
+        # Queue the save for batched background persistence
         if current_user and db_service.db_available:
-            try:
-                await db_service.save_analysis(
-                    user_id=current_user["id"],
-                    analysis_type="feedback",
-                    document_type=None,
-                    text_preview=request.text[:200],
-                    results=result
-                )
-            except Exception as db_error:
-                logger.warning(f"Failed to save analysis: {db_error}")
+            save_queue.enqueue({
+                "user_id": current_user["id"],
+                "analysis_type": "feedback",
+                "document_type": None,
+                "text_preview": preview,
+                "results": result
+            })
         
-        return FeedbackAnalysisResponse(
+        return FeedbackAnalysisResponse.model_construct(
             success=True,
             message="Feedback analysis completed successfully",
             **result
         )
     
     except ValueError as e:
-        logger.error(f"Validation error in feedback analysis: {str(e)}")
+        logger.error("Validation error in feedback analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in feedback analysis: {str(e)}")
+        logger.error("Error in feedback analysis: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Feedback analysis failed"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Feedback analysis failed"
+        ) from e
 
 
 # ==================== BATCH ANALYSIS ====================
 
 @router.post(
     "/analyze/batch",
-    response_model=BatchAnalysisResponse,
     tags=["Analysis"],
     summary="Batch analyze multiple texts",
     responses={
-        200: {"description": "Batch analysis completed"},
+        200: {"model": BatchAnalysisResponse, "description": "Batch analysis completed"},
         400: {"model": ErrorResponse, "description": "Invalid request"},
         500: {"model": ErrorResponse, "description": "Server error"}
     }
 )
 async def batch_analyze(
     request: BatchAnalysisRequest,
-    current_user: Optional[dict] = Depends(get_current_user_optional)
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
     """
     Analyze multiple texts in a single request.
@@ -285,32 +340,33 @@ async def batch_analyze(
     **Authentication:** Optional
     """
     try:
-        logger.info(f"Batch analysis requested: {len(request.texts)} texts, user={'authenticated' if current_user else 'anonymous'}")
-        
-        # Perform batch analysis
-        result = analysis_service.batch_analyze(
-            texts=request.texts,
-            analysis_type=request.analysis_type.value
+        logger.info("Batch analysis requested: %d texts, user=%s", len(request.texts), "authenticated" if current_user else "anonymous")
+
+        # The service fans items out to worker threads, dedupes identical
+        # texts and filters blank ones before any analyzer runs
+        result = await analysis_service.batch_analyze(
+            request.texts, request.analysis_type.value
         )
-        
-        return BatchAnalysisResponse(
-            success=True,
-            message=f"Batch analysis completed: {result['total_processed']} texts processed",
+
+        # Hot path: skip the pydantic response wrap entirely and hand
+        # orjson an already-encodable payload
+        return ORJSONResponse(jsonable_encoder({
+            "success": True,
+            "message": f"Batch analysis completed: {result['total_processed']} texts processed",
             **result
-        )
+        }))
     
     except ValueError as e:
-        logger.error(f"Validation error in batch analysis: {str(e)}")
+        logger.error("Validation error in batch analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in batch analysis: {str(e)}")
+        logger.error("Error in batch analysis: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Batch analysis failed"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Batch analysis failed"
+        ) from e
 
 
 # ==================== DOCUMENT COMPARISON ====================
@@ -318,6 +374,7 @@ async def batch_analyze(
 @router.post(
     "/analyze/compare",
     response_model=DocumentComparisonResponse,
+    response_model_exclude_none=True,
     tags=["Analysis"],
     summary="Compare two documents",
     responses={
@@ -328,7 +385,8 @@ async def batch_analyze(
 )
 async def compare_documents(
     request: DocumentComparisonRequest,
-    current_user: Optional[dict] = Depends(get_current_user_optional)
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
 ):
     """
     Compare two documents for similarity and differences.
@@ -336,10 +394,11 @@ async def compare_documents(
     **Authentication:** Optional
     """
     try:
-        logger.info(f"Document comparison requested, user={'authenticated' if current_user else 'anonymous'}")
+        logger.info("Document comparison requested, user=%s", "authenticated" if current_user else "anonymous")
         
-        # Perform comparison
-        result = analysis_service.compare_documents(
+        # Perform comparison off the event loop
+        result = await run_in_threadpool(
+            analysis_service.compare_documents,
             doc1=request.document1,
             doc2=request.document2
         )
@@ -351,17 +410,16 @@ async def compare_documents(
         )
     
     except ValueError as e:
-        logger.error(f"Validation error in document comparison: {str(e)}")
+        logger.error("Validation error in document comparison: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in document comparison: {str(e)}")
+        logger.error("Error in document comparison: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Document comparison failed"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Document comparison failed"
+        ) from e
 
 
 # ==================== USER STATISTICS (PROTECTED) ====================
@@ -369,11 +427,14 @@ async def compare_documents(
 @router.get(
     "/stats",
     response_model=UserStatsResponse,
+    response_model_exclude_none=True,
     tags=["User"],
     summary="Get user statistics (requires authentication)"
 )
 async def get_user_stats(
-    current_user: dict = Depends(get_current_user)
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db_service: DatabaseService = Depends(get_db_service)
 ):
     """
     Get authenticated user's analysis statistics.
@@ -387,35 +448,49 @@ async def get_user_stats(
     - Last analysis date
     """
     try:
-        logger.info(f"Stats requested for user {current_user['id']}")
+        logger.info("Stats requested for user %s", current_user["id"])
         
         # Get stats from database service
         stats = await db_service.get_user_stats(current_user["id"])
-        
-        return UserStatsResponse(
+
+        # Stats only change when the user submits a new analysis, so key a
+        # weak ETag on the last analysis date and let repolls short-circuit
+        marker = f"{current_user['id']}:{stats.get('last_analysis_date')}"
+        etag = 'W/"' + hashlib.blake2b(marker.encode(), digest_size=8).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+        response = UserStatsResponse(
             success=True,
             message="User statistics retrieved successfully",
             stats=UserStats(**stats)
         )
+        return ORJSONResponse(
+            jsonable_encoder(response),
+            headers={"ETag": etag, "Cache-Control": "private, max-age=5"}
+        )
     
     except Exception as e:
-        logger.error(f"Error fetching user stats: {str(e)}")
+        logger.error("Error fetching user stats: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve user statistics"
-        )
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to retrieve user statistics"
+        ) from e
 
 
 # ==================== USER HISTORY (PROTECTED) ====================
 
 @router.get(
     "/history",
+    response_model=UserHistoryResponse,
+    response_model_exclude_none=True,
     tags=["User"],
     summary="Get analysis history (requires authentication)"
 )
 async def get_user_history(
+    request: Request,
     limit: int = 10,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db_service: DatabaseService = Depends(get_db_service)
 ):
     """
     Get authenticated user's analysis history.
@@ -429,24 +504,31 @@ async def get_user_history(
         List of user's past analyses
     """
     try:
-        logger.info(f"History requested for user {current_user['id']}, limit={limit}")
+        logger.info("History requested for user %s, limit=%d", current_user["id"], limit)
         
         # Get history from database service
         history = await db_service.get_user_history(
             user_id=current_user["id"],
             limit=limit
         )
-        
-        return {
-            "success": True,
-            "message": "History retrieved successfully",
-            "analyses": history,
-            "total": len(history)
-        }
+
+        # Return 304 with no body when the client already has this history
+        etag = 'W/"' + hashlib.blake2b(orjson.dumps(history), digest_size=8).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+        return ORJSONResponse(
+            {
+                "success": True,
+                "message": "History retrieved successfully",
+                "analyses": history,
+                "total": len(history)
+            },
+            headers={"ETag": etag, "Cache-Control": "private, max-age=5"}
+        )
     
     except Exception as e:
-        logger.error(f"Error fetching history: {str(e)}")
+        logger.error("Error fetching history: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve history"
-        )
\ No newline at end of file
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to retrieve history"
+        ) from e
\ No newline at end of file
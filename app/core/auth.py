@@ -1,12 +1,22 @@
 """
 Authentication Middleware
 Handles JWT token verification from Supabase
+
+Verification is layered: local HS256 check when the JWT secret is
+configured, otherwise a Supabase lookup behind a short TTL cache with
+single-flight coalescing (concurrent requests carrying the same token
+share one outbound call instead of issuing N identical ones).
 """
 
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import time
 import httpx
+import jwt
+from cachetools import TTLCache
 from app.core.config import get_settings
 import logging
 
@@ -17,50 +27,295 @@ settings = get_settings()
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
+# Computed once at import - settings don't change after startup. Local JWT
+# verification only needs the secret; the network path needs URL + key.
+_AUTH_ENABLED: bool = bool(
+    settings.SUPABASE_JWT_SECRET or (settings.SUPABASE_URL and settings.SUPABASE_KEY)
+)
+
+# Shared HTTP clients for Supabase calls (created at startup, closed at
+# shutdown). The read client points at the read replica when one is
+# configured; otherwise reads share the primary client.
+_http_client: Optional[httpx.AsyncClient] = None
+_read_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared Supabase HTTP client, creating it if needed.
+
+    Reusing one client keeps connections alive between requests,
+    so token verification doesn't pay a TCP + TLS handshake every time.
+    The pool is deliberately small: HTTP/2 multiplexes many in-flight
+    requests per socket, and every worker process gets its own pool, so
+    a large cap would just eat into Supabase's connection limit. Idle
+    sockets are kept for 30 minutes and transient connect failures are
+    retried once at the transport level.
+
+    Returns:
+        httpx.AsyncClient: Shared client with connection pooling
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.SUPABASE_URL or "",
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=1,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=1800
+                )
+            ),
+            headers={"apikey": settings.SUPABASE_KEY} if settings.SUPABASE_KEY else {}
+        )
+    return _http_client
+
+
+def get_read_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared client for read-only Supabase queries.
+
+    When SUPABASE_READ_URL is set this is a second pooled client pointed
+    at the read replica, keeping SELECT traffic off the primary; without
+    it, reads simply share the primary client so nothing changes for
+    single-instance projects.
+
+    Returns:
+        httpx.AsyncClient: Shared read client with connection pooling
+    """
+    global _read_http_client
+    if not settings.SUPABASE_READ_URL:
+        return get_http_client()
+    if _read_http_client is None:
+        read_key = settings.SUPABASE_READ_KEY or settings.SUPABASE_KEY
+        _read_http_client = httpx.AsyncClient(
+            base_url=settings.SUPABASE_READ_URL,
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=1,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=1800
+                )
+            ),
+            headers={"apikey": read_key} if read_key else {}
+        )
+    return _read_http_client
+
+
+# Ping interval for the idle-socket keepalive (seconds); comfortably
+# below typical server-side idle timeouts
+_KEEPALIVE_INTERVAL_S = 240
+
+
+async def supabase_keepalive() -> None:
+    """
+    Periodically touch PostgREST so pooled sockets stay warm.
+
+    Without traffic, Supabase's edge drops idle connections and the
+    next real request pays a fresh TCP + TLS handshake; a cheap GET
+    every few minutes keeps the pool hot. Runs as a background task
+    started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(_KEEPALIVE_INTERVAL_S)
+        try:
+            await get_http_client().get("/rest/v1/", timeout=5.0)
+        except httpx.HTTPError:
+            # Purely opportunistic - the next real request will reconnect
+            pass
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP clients (called on application shutdown)"""
+    global _http_client, _read_http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _read_http_client is not None:
+        await _read_http_client.aclose()
+        _read_http_client = None
+
+
+# Short-lived cache of verified tokens so bursts of requests with the same
+# bearer token don't each pay a Supabase round trip. Keyed by SHA-256 of the
+# token; entries also carry a hard deadline derived from the token's own exp.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_inflight_verifications: Dict[bytes, "asyncio.Future[dict]"] = {}
+
+
+def _token_cache_ttl(token: str) -> float:
+    """
+    Determine how long a verified token may be cached.
+
+    Uses the JWT's own exp claim (read without signature verification -
+    Supabase already verified the token) so a cached entry never outlives
+    the token itself.
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        float: Cache TTL in seconds (0 or negative means don't cache)
+    """
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        exp = claims.get("exp")
+    except jwt.PyJWTError:
+        exp = None
+
+    ttl = float(settings.AUTH_CACHE_TTL_S)
+    if exp is not None:
+        # Leave a 30 second safety margin before the token expires
+        ttl = min(ttl, exp - time.time() - 30)
+    return ttl
+
 
 async def verify_token_with_supabase(token: str) -> dict:
     """
     Verify JWT token with Supabase.
-    
+
+    Results are cached for a short TTL (bounded by the token's exp claim)
+    so repeated requests with the same token skip the network round trip,
+    and concurrent verifications of the same token share one HTTP call.
+
     Args:
         token: JWT access token
-        
+
     Returns:
         User data dict
-        
+
     Raises:
         HTTPException: If token is invalid
     """
+    # Verify the signature locally when the project's JWT secret is
+    # configured - no network round trip needed for a token Supabase signed
+    if settings.SUPABASE_JWT_SECRET:
+        return _verify_token_locally(token)
+
     if not settings.SUPABASE_URL:
         raise HTTPException(
             status_code=500,
             detail="Supabase is not configured"
         )
-    
+
+    key = hashlib.sha256(token.encode()).digest()
+
+    cached = _token_cache.get(key)
+    if cached is not None:
+        user, deadline = cached
+        if time.monotonic() < deadline:
+            return user
+        del _token_cache[key]
+
+    # Single-flight: if another request is already verifying this token,
+    # wait for its result instead of issuing a duplicate HTTP call
+    pending = _inflight_verifications.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future: "asyncio.Future[dict]" = asyncio.get_running_loop().create_future()
+    _inflight_verifications[key] = future
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.SUPABASE_URL}/auth/v1/user",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "apikey": settings.SUPABASE_KEY
-                }
+        user = await _fetch_user_from_supabase(token)
+        ttl = _token_cache_ttl(token)
+        if ttl > 0:
+            _token_cache[key] = (user, time.monotonic() + ttl)
+        future.set_result(user)
+        return user
+    except BaseException as e:
+        future.set_exception(e)
+        # Consume the exception so an unawaited future doesn't log a warning
+        future.exception()
+        raise
+    finally:
+        _inflight_verifications.pop(key, None)
+
+
+def _verify_token_locally(token: str) -> dict:
+    """
+    Verify a Supabase JWT locally using the project's JWT secret.
+
+    Supabase signs access tokens with HMAC-SHA256, so checking the
+    signature here is equivalent to asking /auth/v1/user but costs
+    microseconds of CPU instead of an external HTTPS round trip.
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        User data dict
+
+    Raises:
+        HTTPException: If token is expired or invalid
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=["HS256"],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]}
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return {
+        "id": payload["sub"],
+        "email": payload.get("email"),
+        "user_metadata": payload.get("user_metadata", {}),
+        "created_at": None
+    }
+
+
+async def _fetch_user_from_supabase(token: str) -> dict:
+    """
+    Fetch the user behind a token from Supabase (uncached).
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        User data dict
+
+    Raises:
+        HTTPException: If token is invalid or Supabase is unreachable
+    """
+    try:
+        response = await get_http_client().get(
+            "/auth/v1/user",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 200:
+            user_data = response.json()
+            return {
+                "id": user_data["id"],
+                "email": user_data["email"],
+                "user_metadata": user_data.get("user_metadata", {}),
+                "created_at": user_data.get("created_at")
+            }
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                return {
-                    "id": user_data["id"],
-                    "email": user_data["email"],
-                    "user_metadata": user_data.get("user_metadata", {}),
-                    "created_at": user_data.get("created_at")
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
     except httpx.RequestError as e:
         logger.error(f"Error verifying token: {str(e)}")
         raise HTTPException(
@@ -85,6 +340,12 @@ async def get_current_user(
     Raises:
         HTTPException: If not authenticated or token invalid
     """
+    if not _AUTH_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Authentication is not configured"
+        )
+
     token = credentials.credentials
     return await verify_token_with_supabase(token)
 
@@ -102,9 +363,11 @@ async def get_current_user_optional(
     Returns:
         User info dict if authenticated, None otherwise
     """
-    if not credentials:
+    # Skip verification entirely when no token was sent or auth isn't
+    # configured - public traffic pays zero overhead either way
+    if not credentials or not _AUTH_ENABLED:
         return None
-    
+
     try:
         return await verify_token_with_supabase(credentials.credentials)
     except HTTPException:
@@ -113,4 +376,4 @@ async def get_current_user_optional(
 
 def is_auth_enabled() -> bool:
     """Check if authentication is properly configured"""
-    return bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
\ No newline at end of file
+    return _AUTH_ENABLED
\ No newline at end of file
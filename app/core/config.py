@@ -4,6 +4,7 @@ Handles environment variables and application settings
 """
 
 from pydantic_settings import BaseSettings
+from functools import lru_cache
 from typing import Optional
 import os
 from pathlib import Path
@@ -25,22 +26,26 @@ class Settings(BaseSettings):
     # Supabase Configuration
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
+    SUPABASE_JWT_SECRET: Optional[str] = None  # Enables local token verification
+    SUPABASE_READ_URL: Optional[str] = None  # Read replica; falls back to primary
+    SUPABASE_READ_KEY: Optional[str] = None
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
+    AUTH_CACHE_TTL_S: int = 120  # How long verified tokens are cached (seconds)
     
     # CORS Settings
-    CORS_ORIGINS: list[str] = [
+    CORS_ORIGINS: tuple[str, ...] = (
     "http://localhost:3000",
-    "http://localhost:3001", 
+    "http://localhost:3001",
     "http://127.0.0.1:3000",
     "https://smartdoc-ai-frontend.vercel.app",  # Your actual Vercel URL
     "https://smartdoc-ai-frontend-*.vercel.app",  # Preview deployments
-]
-    
+)
+
     # File Upload Settings
     MAX_FILE_SIZE_MB: int = 10
-    ALLOWED_FILE_TYPES: list = [".txt", ".pdf", ".docx", ".doc"]
+    ALLOWED_FILE_TYPES: tuple[str, ...] = (".txt", ".pdf", ".docx", ".doc")
     
     # Database Settings
     DATABASE_URL: Optional[str] = None
@@ -50,16 +55,16 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-# Create global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
-    Get application settings instance.
-    
+    Get the application settings instance.
+
+    Cached so environment parsing happens exactly once; safe to use as a
+    FastAPI dependency, and tests can reset it via get_settings.cache_clear().
+
     Returns:
         Settings: Application settings
     """
-    return settings
+    return Settings()
 
@@ -7,28 +7,75 @@ Focused on South African legal context
 from typing import Dict, List, Optional, Tuple
 import re
 from datetime import datetime
+import ahocorasick
 from .text_analyzer import TextAnalyzer
 
 
+def _build_doctype_automaton(type_keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over all document-type keywords.
+
+    Each keyword maps to its document-type index, so classification is
+    one linear pass over the text instead of one substring scan per
+    keyword.
+
+    Args:
+        type_keywords: Mapping of document type to its keyword list
+
+    Returns:
+        Compiled automaton mapping matches to (type_index, keyword) pairs
+    """
+    automaton = ahocorasick.Automaton()
+    for idx, keywords in enumerate(type_keywords.values()):
+        for keyword in keywords:
+            automaton.add_word(keyword, (idx, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_risk_automaton(high_terms: frozenset, medium_terms: frozenset) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over all risk terms.
+
+    One automaton pass scans the document linearly for every term at
+    once, instead of one substring scan per term.
+
+    Args:
+        high_terms: High-risk term list
+        medium_terms: Medium-risk term list
+
+    Returns:
+        Compiled automaton mapping matches to (level, term) pairs
+    """
+    automaton = ahocorasick.Automaton()
+    for term in high_terms:
+        automaton.add_word(term, ('H', term))
+    for term in medium_terms:
+        automaton.add_word(term, ('M', term))
+    automaton.make_automaton()
+    return automaton
+
+
 class LegalAnalyzer(TextAnalyzer):
     """
     Specialized analyzer for legal documents with South African context.
     Inherits from TextAnalyzer and extends with legal-specific functionality.
     """
     
-    # South African legal keywords for risk assessment
-    HIGH_RISK_TERMS = [
+    # South African legal keywords for risk assessment; frozen so term
+    # membership is hashed and the collections are immutable class data
+    HIGH_RISK_TERMS = frozenset({
         'penalty', 'penalties', 'termination', 'breach', 'default',
         'liability', 'damages', 'indemnify', 'indemnification',
         'waiver', 'forfeit', 'forfeiture', 'non-refundable',
         'irrevocable', 'unconditional', 'binding', 'irreversible'
-    ]
+    })
     
-    MEDIUM_RISK_TERMS = [
+    MEDIUM_RISK_TERMS = frozenset({
         'obligation', 'obligations', 'requirement', 'requirements',
         'must', 'shall', 'mandatory', 'compulsory', 'necessary',
         'restricted', 'prohibition', 'prohibited', 'forbidden'
-    ]
+    })
     
     # South African company suffixes
     SA_COMPANY_SUFFIXES = [
@@ -39,6 +86,17 @@ class LegalAnalyzer(TextAnalyzer):
         'Inc', 'Incorporated'
     ]
     
+    # Keywords used to classify the document type
+    DOCUMENT_TYPE_KEYWORDS = {
+        'Employment Contract': ['employment', 'employee', 'employer', 'position', 'duties'],
+        'Lease Agreement': ['lease', 'tenant', 'landlord', 'premises', 'rent', 'rental'],
+        'NDA': ['non-disclosure', 'confidential', 'confidentiality agreement', 'nda'],
+        'Service Agreement': ['service', 'services', 'provider', 'client', 'deliverables'],
+        'Sales Agreement': ['sale', 'purchase', 'buyer', 'seller', 'goods'],
+        'Partnership Agreement': ['partner', 'partnership', 'joint venture'],
+        'Loan Agreement': ['loan', 'lender', 'borrower', 'principal', 'interest']
+    }
+
     # Common legal clause types
     CLAUSE_PATTERNS = {
         'confidentiality': r'confidential(?:ity)?|non-disclosure|proprietary information',
@@ -52,6 +110,68 @@ class LegalAnalyzer(TextAnalyzer):
         'notice': r'notice|notification|inform|advise in writing',
         'governing_law': r'governing law|applicable law|south african law'
     }
+
+    # Role keywords for party identification; group names double as role
+    # labels (underscores stand in for spaces)
+    ROLE_KEYWORDS = {
+        'Employer': r'Employer',
+        'Employee': r'Employee',
+        'Landlord': r'Landlord',
+        'Tenant': r'Tenant',
+        'Client': r'Client',
+        'Service_Provider': r'(?:Service\s+)?Provider'
+    }
+
+    # Patterns compiled once at class-definition time - re-running the raw
+    # strings through re.finditer pays the module cache lookup on every call
+    # One alternation with named groups - a single pass over the text
+    # replaces ten per-clause sweeps (matched against lowercased text)
+    _CLAUSE_UNION_C = re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in CLAUSE_PATTERNS.items())
+    )
+    # All six roles in one alternation; the named group that matched is
+    # the role, the trailing (unnamed) group captures the party name
+    _ROLE_UNION_C = re.compile(
+        r'(?:the\s+)?(?:'
+        + '|'.join(f'(?P<{role}>{keyword})' for role, keyword in ROLE_KEYWORDS.items())
+        + r')[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
+        re.IGNORECASE
+    )
+    _ROLE_NAMES = tuple(ROLE_KEYWORDS)
+    # One union over every company suffix - a single scan instead of
+    # eleven, with the matched suffix captured in group 2
+    _SUFFIX_UNION_C = re.compile(
+        r'([A-Z][A-Za-z0-9\s&]{2,50})\s+('
+        + '|'.join(re.escape(suffix) for suffix in SA_COMPANY_SUFFIXES)
+        + r')'
+    )
+    _BETWEEN_PATTERN_C = re.compile(
+        r'between\s+([A-Z][A-Za-z\s&\.]{2,100})\s+(?:and|&)\s+([A-Z][A-Za-z\s&\.]{2,100})',
+        re.IGNORECASE
+    )
+    # All three date shapes in one alternation, scanned in a single pass;
+    # the named group that matched identifies the format
+    _DATE_UNION_C = re.compile(
+        r'\b(?:'
+        r'(?P<words>\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})'
+        r'|(?P<iso>\d{4}[/-]\d{1,2}[/-]\d{1,2})'
+        r'|(?P<dmy>\d{1,2}[/-]\d{1,2}[/-]\d{4})'
+        r')\b',
+        re.IGNORECASE
+    )
+    _DATE_FORMATS = {'words': 'DD Month YYYY', 'iso': 'YYYY-MM-DD', 'dmy': 'DD/MM/YYYY'}
+    # One alternation covers all three amount shapes (ZAR/R prefix, Rand
+    # suffix) so extraction is a single pass; the suffix branch keeps its
+    # case-insensitivity via a scoped inline flag
+    _AMOUNT_UNION_C = re.compile(
+        r'(?:ZAR|R)\s*(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)'
+        r'|(?i:(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)\s*Rands?)'
+    )
+
+    # Single-pass multi-pattern matchers for the term lists above
+    _RISK_AUTOMATON = _build_risk_automaton(HIGH_RISK_TERMS, MEDIUM_RISK_TERMS)
+    _DOCTYPE_AUTOMATON = _build_doctype_automaton(DOCUMENT_TYPE_KEYWORDS)
+    _DOCTYPE_NAMES = tuple(DOCUMENT_TYPE_KEYWORDS)
     
     def __init__(self, text: str, document_type: Optional[str] = None):
         """
@@ -63,10 +183,12 @@ class LegalAnalyzer(TextAnalyzer):
         """
         super().__init__(text)
         self.document_type = document_type
+        self._text_len = len(self.text)
         self._parties = None
         self._dates = None
         self._amounts = None
         self._clauses = None
+        self._identified_type = None
     
     def identify_document_type(self) -> str:
         """
@@ -75,26 +197,26 @@ class LegalAnalyzer(TextAnalyzer):
         Returns:
             str: Identified document type
         """
-        text_lower = self.text.lower()
-        
-        type_keywords = {
-            'Employment Contract': ['employment', 'employee', 'employer', 'position', 'duties'],
-            'Lease Agreement': ['lease', 'tenant', 'landlord', 'premises', 'rent', 'rental'],
-            'NDA': ['non-disclosure', 'confidential', 'confidentiality agreement', 'nda'],
-            'Service Agreement': ['service', 'services', 'provider', 'client', 'deliverables'],
-            'Sales Agreement': ['sale', 'purchase', 'buyer', 'seller', 'goods'],
-            'Partnership Agreement': ['partner', 'partnership', 'joint venture'],
-            'Loan Agreement': ['loan', 'lender', 'borrower', 'principal', 'interest']
-        }
-        
-        scores = {}
-        for doc_type, keywords in type_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[doc_type] = score
-        
-        if max(scores.values()) > 0:
-            return max(scores, key=scores.get)
-        return 'Unknown Document Type'
+        if self._identified_type is not None:
+            return self._identified_type
+
+        # One automaton pass over the text scores every document type at
+        # once; each distinct keyword counts once, as before
+        found = set()
+        for _, (idx, keyword) in self._DOCTYPE_AUTOMATON.iter(self.text_lower):
+            found.add((idx, keyword))
+
+        scores = [0] * len(self._DOCTYPE_NAMES)
+        for idx, _ in found:
+            scores[idx] += 1
+
+        if max(scores) > 0:
+            self._identified_type = self._DOCTYPE_NAMES[
+                max(range(len(scores)), key=scores.__getitem__)
+            ]
+        else:
+            self._identified_type = 'Unknown Document Type'
+        return self._identified_type
     
     def extract_parties(self) -> List[Dict[str, str]]:
         """
@@ -108,50 +230,47 @@ class LegalAnalyzer(TextAnalyzer):
             return self._parties
         
         parties = []
+        seen = set()  # O(1) dedup instead of rescanning the parties list
         text = self.text
         
-        # Pattern 1: Company names with SA suffixes
-        for suffix in self.SA_COMPANY_SUFFIXES:
-            # Match company name before suffix (up to 5 words)
-            pattern = r'([A-Z][A-Za-z0-9\s&]{2,50})\s+' + re.escape(suffix)
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                company_name = f"{match.group(1).strip()} {suffix}"
-                if company_name not in [p['name'] for p in parties]:
-                    parties.append({
-                        'name': company_name,
-                        'type': 'Company',
-                        'role': 'Party'
-                    })
+        # Pattern 1: Company names with SA suffixes (up to 5 words)
+        for match in self._SUFFIX_UNION_C.finditer(text):
+            company_name = f"{match.group(1).strip()} {match.group(2)}"
+            if company_name not in seen:
+                seen.add(company_name)
+                parties.append({
+                    'name': company_name,
+                    'type': 'Company',
+                    'role': 'Party'
+                })
         
         # Pattern 2: "between X and Y" structure
-        between_pattern = r'between\s+([A-Z][A-Za-z\s&\.]{2,100})\s+(?:and|&)\s+([A-Z][A-Za-z\s&\.]{2,100})'
-        between_matches = re.finditer(between_pattern, text, re.IGNORECASE)
+        between_matches = self._BETWEEN_PATTERN_C.finditer(text)
         for match in between_matches:
             party1 = match.group(1).strip()
             party2 = match.group(2).strip()
             
-            if len(party1.split()) <= 10 and party1 not in [p['name'] for p in parties]:
+            if len(party1.split()) <= 10 and party1 not in seen:
+                seen.add(party1)
                 parties.append({'name': party1, 'type': 'Entity', 'role': 'First Party'})
-            if len(party2.split()) <= 10 and party2 not in [p['name'] for p in parties]:
+            if len(party2.split()) <= 10 and party2 not in seen:
+                seen.add(party2)
                 parties.append({'name': party2, 'type': 'Entity', 'role': 'Second Party'})
         
-        # Pattern 3: Role-based identification
-        role_patterns = {
-            'Employer': r'(?:the\s+)?Employer[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
-            'Employee': r'(?:the\s+)?Employee[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
-            'Landlord': r'(?:the\s+)?Landlord[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
-            'Tenant': r'(?:the\s+)?Tenant[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
-            'Client': r'(?:the\s+)?Client[:\s]+([A-Z][A-Za-z\s&\.]{2,50})',
-            'Service Provider': r'(?:the\s+)?(?:Service\s+)?Provider[:\s]+([A-Z][A-Za-z\s&\.]{2,50})'
-        }
-        
-        for role, pattern in role_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                party_name = match.group(1).strip()
-                if len(party_name.split()) <= 8 and party_name not in [p['name'] for p in parties]:
-                    parties.append({'name': party_name, 'type': 'Entity', 'role': role})
+        # Pattern 3: Role-based identification (one pass for all roles)
+        for match in self._ROLE_UNION_C.finditer(text):
+            party_name = match.group(match.lastindex).strip()
+            if len(party_name.split()) <= 8 and party_name not in seen:
+                seen.add(party_name)
+                role = next(
+                    name for name in self._ROLE_NAMES
+                    if match.group(name) is not None
+                )
+                parties.append({
+                    'name': party_name,
+                    'type': 'Entity',
+                    'role': role.replace('_', ' ')
+                })
         
         self._parties = parties if parties else [{'name': 'Not identified', 'type': 'Unknown', 'role': 'Unknown'}]
         return self._parties
@@ -167,35 +286,21 @@ class LegalAnalyzer(TextAnalyzer):
             return self._dates
         
         dates = []
-        
-        # Pattern 1: DD Month YYYY (e.g., 15 March 2024)
-        pattern1 = r'\b(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})\b'
-        matches = re.finditer(pattern1, self.text, re.IGNORECASE)
-        for match in matches:
-            dates.append({
-                'date': match.group(0),
-                'format': 'DD Month YYYY',
-                'context': self._get_context(match.start(), match.end())
-            })
-        
-        # Pattern 2: YYYY-MM-DD or YYYY/MM/DD
-        pattern2 = r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b'
-        matches = re.finditer(pattern2, self.text)
-        for match in matches:
-            dates.append({
-                'date': match.group(0),
-                'format': 'YYYY-MM-DD',
-                'context': self._get_context(match.start(), match.end())
-            })
-        
-        # Pattern 3: DD/MM/YYYY
-        pattern3 = r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b'
-        matches = re.finditer(pattern3, self.text)
-        for match in matches:
+        # Spans already reported once are skipped, so a date string that
+        # two format branches could both hit is never emitted twice (and
+        # never pays a second _get_context call)
+        seen = set()
+
+        # One pass over the text covers all three formats in text order
+        for match in self._DATE_UNION_C.finditer(self.text):
+            span = match.span()
+            if span in seen:
+                continue
+            seen.add(span)
             dates.append({
                 'date': match.group(0),
-                'format': 'DD/MM/YYYY',
-                'context': self._get_context(match.start(), match.end())
+                'format': self._DATE_FORMATS[match.lastgroup],
+                'context': self._get_context(span[0], span[1])
             })
         
         self._dates = dates if dates else [{'date': 'No dates found', 'format': 'N/A', 'context': ''}]
@@ -212,35 +317,18 @@ class LegalAnalyzer(TextAnalyzer):
             return self._amounts
         
         amounts = []
-        
-        # Pattern 1: R followed by amount (South African Rands)
-        pattern1 = r'R\s*(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)'
-        matches = re.finditer(pattern1, self.text)
-        for match in matches:
-            amounts.append({
-                'amount': match.group(0),
-                'currency': 'ZAR (Rands)',
-                'context': self._get_context(match.start(), match.end())
-            })
-        
-        # Pattern 2: Amount followed by Rand/Rands
-        pattern2 = r'(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)\s*Rands?'
-        matches = re.finditer(pattern2, self.text, re.IGNORECASE)
-        for match in matches:
-            amounts.append({
-                'amount': match.group(0),
-                'currency': 'ZAR (Rands)',
-                'context': self._get_context(match.start(), match.end())
-            })
-        
-        # Pattern 3: ZAR amounts
-        pattern3 = r'ZAR\s*(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)'
-        matches = re.finditer(pattern3, self.text)
-        for match in matches:
+        seen = set()
+
+        # One pass over the text; all branches are Rand-denominated
+        for match in self._AMOUNT_UNION_C.finditer(self.text):
+            span = match.span()
+            if span in seen:
+                continue
+            seen.add(span)
             amounts.append({
                 'amount': match.group(0),
                 'currency': 'ZAR (Rands)',
-                'context': self._get_context(match.start(), match.end())
+                'context': self._get_context(span[0], span[1])
             })
         
         self._amounts = amounts if amounts else [{'amount': 'No amounts found', 'currency': 'N/A', 'context': ''}]
@@ -257,19 +345,11 @@ class LegalAnalyzer(TextAnalyzer):
             return self._clauses
         
         identified_clauses = {}
-        text_lower = self.text.lower()
-        
-        for clause_type, pattern in self.CLAUSE_PATTERNS.items():
-            matches = re.finditer(pattern, text_lower)
-            occurrences = []
-            
-            for match in matches:
-                context = self._get_context(match.start(), match.end(), chars=150)
-                occurrences.append(context)
-            
-            if occurrences:
-                identified_clauses[clause_type] = occurrences
-        
+
+        for match in self._CLAUSE_UNION_C.finditer(self.text_lower):
+            context = self._get_context(match.start(), match.end(), chars=150)
+            identified_clauses.setdefault(match.lastgroup, []).append(context)
+
         self._clauses = identified_clauses
         return self._clauses
     
@@ -280,10 +360,20 @@ class LegalAnalyzer(TextAnalyzer):
         Returns:
             Dict: Risk assessment with score and breakdown
         """
-        text_lower = self.text.lower()
-        
-        high_risk_count = sum(1 for term in self.HIGH_RISK_TERMS if term in text_lower)
-        medium_risk_count = sum(1 for term in self.MEDIUM_RISK_TERMS if term in text_lower)
+        text_lower = self.text_lower
+
+        # One linear sweep finds every risk term; dedupe into sets so the
+        # score still counts distinct terms present, not occurrences
+        high_found = set()
+        medium_found = set()
+        for _, (level, term) in self._RISK_AUTOMATON.iter(text_lower):
+            if level == 'H':
+                high_found.add(term)
+            else:
+                medium_found.add(term)
+
+        high_risk_count = len(high_found)
+        medium_risk_count = len(medium_found)
         
         # Calculate risk score (0-100)
         # High risk terms worth 3 points, medium worth 1 point
@@ -324,21 +414,36 @@ class LegalAnalyzer(TextAnalyzer):
         Returns:
             str: Context string
         """
-        context_start = max(0, start - chars)
-        context_end = min(len(self.text), end + chars)
-        context = self.text[context_start:context_end].strip()
-        
-        if context_start > 0:
+        text = self.text
+        raw_start = max(0, start - chars)
+        raw_end = min(self._text_len, end + chars)
+
+        # Trim whitespace by moving the bounds before slicing, so this
+        # hot path allocates one string instead of slice-then-strip.
+        # It runs once per regex match across several sweeps.
+        trim_start, trim_end = raw_start, raw_end
+        while trim_start < trim_end and text[trim_start].isspace():
+            trim_start += 1
+        while trim_end > trim_start and text[trim_end - 1].isspace():
+            trim_end -= 1
+
+        context = text[trim_start:trim_end]
+
+        if raw_start > 0:
             context = '...' + context
-        if context_end < len(self.text):
+        if raw_end < self._text_len:
             context = context + '...'
         
         return context
     
-    def get_legal_summary(self) -> Dict[str, any]:
+    def get_legal_summary(self, analysis_time: Optional[str] = None) -> Dict[str, any]:
         """
         Get comprehensive legal document analysis.
         
+        Args:
+            analysis_time: ISO timestamp to stamp the summary with; batch
+                callers can format one per request instead of one per document
+        
         Returns:
             Dict: Complete legal analysis
         """
@@ -356,7 +461,7 @@ class LegalAnalyzer(TextAnalyzer):
         return {
             'document_info': {
                 'document_type': document_type,
-                'analysis_date': datetime.now().isoformat(),
+                'analysis_date': analysis_time or datetime.now().isoformat(),
             },
             'parties': parties,
             'key_dates': dates[:5] if len(dates) > 5 else dates,  # Limit to top 5
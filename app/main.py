@@ -3,30 +3,59 @@ SmartDoc AI - Main FastAPI Application
 Legal Document Analysis Platform for South African Businesses
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+import anyio.to_thread
+import asyncio
 import logging
+import queue
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from app.api.routes import router
+from app.core.auth import close_http_client, get_http_client, supabase_keepalive
 from app.core.config import get_settings
+from app.services.analysis_service import AnalysisService
+from app.services.database_service import DatabaseService
+from app.services.save_queue import save_queue, usage_queue
 
-# Configure logging
+# Configure logging: records go through an in-memory queue and are written
+# to stdout by a background listener thread, so request handlers never block
+# on stream flushes
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+_queue_handler = QueueHandler(_log_queue)
+# QueueHandler.prepare() bakes its formatter into record.msg before the
+# listener formats again; keep the queue side message-only so the
+# listener's formatter is the only one that runs (basicConfig would
+# otherwise assign it the default levelname:name:message formatter)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout)
+        _queue_handler
     ]
 )
+_log_listener = QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Interactive docs and the schema endpoint are development conveniences;
+# in production they cost schema builds and widen the surface for nothing
+_docs_enabled = settings.ENVIRONMENT != "production"
+
+
 
 # ==================== LIFESPAN EVENTS ====================
 
@@ -42,12 +71,54 @@ async def lifespan(app: FastAPI):
     logger.info(f"OpenAI API Key configured: {bool(settings.OPENAI_API_KEY)}")
     logger.info(f"Supabase configured: {bool(settings.SUPABASE_URL)}")
     logger.info("=" * 60)
-    
+
+    # Analysis work runs in the threadpool (see routes.py); raise the
+    # default limit of 40 so CPU-bound analyses don't queue behind each other
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 80
+
+    # Warm up the shared Supabase HTTP client so the first request
+    # doesn't pay the client construction cost, and keep its pooled
+    # sockets from idling out between bursts of traffic
+    keepalive_task = None
+    if settings.SUPABASE_URL:
+        get_http_client()
+        keepalive_task = asyncio.create_task(supabase_keepalive())
+
+    # Create per-worker service instances (import stays cheap, teardown
+    # is deterministic) and start the batched analysis-save worker
+    app.state.analysis_service = AnalysisService()
+    app.state.db_service = DatabaseService()
+    save_queue.start(app.state.db_service)
+    usage_queue.start(app.state.db_service)
+
+    # Build the OpenAPI schema once at startup (FastAPI memoizes it on
+    # app.openapi_schema) so the first /openapi.json hit doesn't pay the
+    # full route/model walk
+    if _docs_enabled:
+        app.openapi()
+
+    # The root payload is constant for the process lifetime; build it
+    # once so every / hit reuses the same dict
+    app.state.root_payload = {
+        "name": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+        "description": "AI-powered legal document analysis for South African businesses",
+        "documentation": "/docs",
+        "health_check": "/api/v1/health",
+        "status": "operational",
+        "environment": settings.ENVIRONMENT
+    }
+
     yield
-    
+
     # SHUTDOWN
     logger.info("=" * 60)
     logger.info(f"🛑 Shutting down {settings.APP_NAME}")
+    await save_queue.stop()
+    await usage_queue.stop()
+    if keepalive_task is not None:
+        keepalive_task.cancel()
+    await close_http_client()
     logger.info("=" * 60)
 
 
@@ -117,50 +188,98 @@ app = FastAPI(
     For issues or questions, contact: support@smartdocai.com
     """,
     version=settings.APP_VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    docs_url="/docs" if _docs_enabled else None,
+    redoc_url="/redoc" if _docs_enabled else None,
+    openapi_url="/openapi.json" if _docs_enabled else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 
 # ==================== MIDDLEWARE ====================
 
-# CORS Middleware
+# Compress large JSON payloads (legal/batch responses) on the fly;
+# small responses skip compression entirely
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# CORS Middleware. Listing the real methods and headers lets Starlette
+# answer preflights without echoing per-request values, and max_age lets
+# browsers cache the preflight for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=list(settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,
 )
 
 
+# High-traffic plumbing endpoints whose log lines are pure noise
+_QUIET_PATHS = frozenset({"/api/v1/health", "/health", "/health/", "/docs", "/openapi.json"})
+
+
 # Request Logging Middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
+class RequestLoggingMiddleware:
     """
-    Log all incoming requests
+    Pure ASGI middleware that logs every request and its outcome.
+
+    @app.middleware("http") would wrap handlers in BaseHTTPMiddleware,
+    which buffers responses through an anyio memory channel and spawns a
+    task pair per request; operating at the ASGI level only intercepts
+    the response-start message.
     """
-    start_time = datetime.now()
-    
-    # Log request
-    logger.info(f"→ {request.method} {request.url.path}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Calculate duration
-    duration = (datetime.now() - start_time).total_seconds()
-    
-    # Log response
-    logger.info(f"← {request.method} {request.url.path} - {response.status_code} ({duration:.2f}s)")
-    
-    return response
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+
+        if path in _QUIET_PATHS or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        logger.info("→ %s %s", method, path)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            logger.info("← %s %s - %s (%.2fs)", method, path, status_code, duration)
+
+
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # ==================== EXCEPTION HANDLERS ====================
 
+@app.exception_handler(HTTPException)
+async def http_exception_handler(request: Request, exc: HTTPException):
+    """
+    Handle HTTP exceptions with the fast orjson serializer
+    """
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"success": False, "detail": exc.detail},
+        headers=exc.headers
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -174,15 +293,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "type": error["type"]
         })
     
-    logger.warning(f"Validation error on {request.url.path}: {errors}")
-    
-    return JSONResponse(
+    logger.warning("Validation error on %s: %s", request.url.path, errors)
+
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
             "error": "Validation error",
             "details": errors,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
@@ -192,40 +311,48 @@ async def general_exception_handler(request: Request, exc: Exception):
     """
     Handle general exceptions
     """
-    logger.error(f"Unhandled exception on {request.url.path}: {str(exc)}", exc_info=True)
-    
-    return JSONResponse(
+    logger.error("Unhandled exception on %s: %s", request.url.path, exc, exc_info=True)
+
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
             "error": "Internal server error",
             "message": "An unexpected error occurred. Please try again later.",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
 
 # ==================== ROUTES ====================
 
+# Bare sub-app for liveness probes: no docs, no CORS, no gzip - probes
+# hit one route lookup instead of traversing the middleware stack
+health_app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+
+_HEALTH_PAYLOAD = {"status": "ok"}
+
+
+@health_app.get("/")
+async def health_probe():
+    """Minimal liveness probe"""
+    return _HEALTH_PAYLOAD
+
+
+app.mount("/health", health_app)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
 
 
 # Root endpoint
 @app.get("/", tags=["Root"])
-async def root():
+async def root(request: Request):
     """
     Root endpoint - API information
     """
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "description": "AI-powered legal document analysis for South African businesses",
-        "documentation": "/docs",
-        "health_check": "/api/v1/health",
-        "status": "operational",
-        "environment": settings.ENVIRONMENT
-    }
+    return request.app.state.root_payload
 
 
 # ==================== STARTUP MESSAGE ====================
@@ -241,5 +368,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
         log_level="info"
     )
\ No newline at end of file
@@ -4,7 +4,8 @@ Defines data structures for API endpoints
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Mapping
 from datetime import datetime
 from enum import Enum
 
@@ -48,7 +49,7 @@ class BaseResponse(BaseModel):
 
 class TextAnalysisRequest(BaseModel):
     """Request model for text analysis"""
-    text: str = Field(..., min_length=10, description="Text content to analyze")
+    text: str = Field(..., min_length=10, max_length=1_000_000, description="Text content to analyze")
     analysis_type: AnalysisType = Field(default=AnalysisType.TEXT, description="Type of analysis")
     
     @validator('text')
@@ -107,7 +108,7 @@ class TextAnalysisResponse(BaseResponse):
 
 class LegalAnalysisRequest(BaseModel):
     """Request model for legal document analysis"""
-    text: str = Field(..., min_length=50, description="Legal document text")
+    text: str = Field(..., min_length=50, max_length=1_000_000, description="Legal document text")
     document_type: Optional[DocumentType] = Field(None, description="Type of legal document")
     
     @validator('text')
@@ -179,7 +180,7 @@ class LegalAnalysisResponse(BaseResponse):
 
 class FeedbackAnalysisRequest(BaseModel):
     """Request model for feedback/review analysis"""
-    text: str = Field(..., min_length=10, description="Feedback or review text")
+    text: str = Field(..., min_length=10, max_length=1_000_000, description="Feedback or review text")
     source: Optional[str] = Field(None, description="Source of feedback (e.g., 'customer_review', 'employee_feedback')")
     
     @validator('text')
@@ -234,6 +235,12 @@ class AnalysisHistoryResponse(BaseResponse):
     items: List[AnalysisHistoryItem]
 
 
+class UserHistoryResponse(BaseResponse):
+    """Response model for the /history endpoint"""
+    analyses: List[Dict[str, Any]]
+    total: int
+
+
 # ==================== ERROR MODELS ====================
 
 class ErrorDetail(BaseModel):
@@ -269,15 +276,21 @@ class ErrorResponse(BaseModel):
 
 # ==================== HEALTH CHECK MODELS ====================
 
+# Shared immutable default for HealthCheckResponse.services - pydantic
+# deep-copies mutable class defaults per instance, a read-only proxy is
+# handed out as-is
+_HEALTH_SERVICES: Mapping[str, str] = MappingProxyType({
+    "database": "unknown",
+    "api": "operational"
+})
+
+
 class HealthCheckResponse(BaseModel):
     """Health check response"""
     status: str = "healthy"
     version: str
     timestamp: datetime = Field(default_factory=datetime.now)
-    services: Dict[str, str] = {
-        "database": "unknown",
-        "api": "operational"
-    }
+    services: Mapping[str, str] = Field(default_factory=lambda: _HEALTH_SERVICES)
 
 
 # ==================== USER MODELS (for future auth) ====================
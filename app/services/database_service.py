@@ -1,81 +1,389 @@
 """
 Database Service
 Handles all database operations with Supabase
+
+Queries go straight to the PostgREST API over the shared async HTTP
+client (see app.core.auth) instead of the synchronous supabase-py
+client, which would block the event loop for the full round-trip and
+serialize concurrent requests. The shared client keeps connections
+alive and multiplexes requests over HTTP/2.
 """
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from supabase import create_client, Client
-from app.core.config import settings
+from typing import Awaitable, Callable, Optional, List, Dict, Any, Tuple
+import asyncio
+import time
+import uuid
+
+import httpx
+from cachetools import TTLCache
+from fastapi.encoders import jsonable_encoder
+from app.core.auth import get_http_client, get_read_http_client
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# PostgREST lives under this prefix on the Supabase project URL
+_REST = "/rest/v1"
+
+# The shared client already carries the apikey header; PostgREST also
+# wants the key as a bearer token
+_AUTH_HEADERS = (
+    {"Authorization": f"Bearer {settings.SUPABASE_KEY}"}
+    if settings.SUPABASE_KEY else {}
+)
+_READ_AUTH_HEADERS = (
+    {"Authorization": f"Bearer {settings.SUPABASE_READ_KEY}"}
+    if settings.SUPABASE_READ_URL and settings.SUPABASE_READ_KEY
+    else _AUTH_HEADERS
+)
+
+# Users who wrote recently read from the primary for a few seconds so
+# they always see their own writes despite replica lag
+_RECENT_WRITE_TTL = 5
+_recent_writers: TTLCache = TTLCache(maxsize=10_000, ttl=_RECENT_WRITE_TTL)
+
+# Stale-while-revalidate cache for per-user reads (profile, statistics).
+# Entries younger than the fresh TTL are served directly; older entries
+# are still served but kick off a background refresh, so repeat
+# authenticated users never wait on the Supabase round-trip. The stale
+# TTL bounds how old a served value can ever be.
+_SWR_FRESH_TTL = 60
+_SWR_STALE_TTL = 900
+_profile_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_SWR_STALE_TTL)
+_stats_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_SWR_STALE_TTL)
+# Keys with a refresh already in flight, so a burst of stale hits
+# schedules one fetch rather than one per request
+_swr_refreshing: set = set()
+
+# The event loop only holds weak references to tasks, so fire-and-forget
+# writes and cache refreshes must be anchored here or they can be
+# garbage-collected mid-execution
+_background_tasks: set = set()
+
+
+def _spawn(coro) -> None:
+    """Schedule a background task and keep a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _keyset_filter(column: str, after: Tuple[str, str]) -> str:
+    """
+    PostgREST filter selecting rows strictly after a (timestamp, id)
+    cursor when ordering by both descending.
+    """
+    value, row_id = after
+    return f'({column}.lt."{value}",and({column}.eq."{value}",id.lt."{row_id}"))'
 
 
 class DatabaseService:
     """
     Service for handling database operations with Supabase.
     """
-    
+
     def __init__(self):
-        """Initialize Supabase client"""
-        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+        """Check configuration (the HTTP client itself is shared)"""
+        self._configured = bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
+        if not self._configured:
             print("⚠️  Supabase not configured. Database features will be disabled.")
-            self.client = None
-        else:
-            self.client: Client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_KEY
-            )
-    
+
     def is_configured(self) -> bool:
         """Check if database is configured"""
-        return self.client is not None
-    
+        return self._configured
+
+    @property
+    def db_available(self) -> bool:
+        """Whether database features are available"""
+        return self._configured
+
+    # ========== POSTGREST PLUMBING ==========
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """The shared async HTTP client for the primary (pooled, HTTP/2)"""
+        return get_http_client()
+
+    @staticmethod
+    def _mark_writer(rows: Any) -> None:
+        """Remember which user just wrote, for read-your-writes routing"""
+        for row in rows if isinstance(rows, list) else [rows]:
+            user_id = row.get('user_id') if isinstance(row, dict) else None
+            if user_id:
+                _recent_writers[user_id] = True
+
+    async def _select(
+        self,
+        table: str,
+        params: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Run a PostgREST select; returns the row list.
+
+        Reads go to the replica client when one is configured, except
+        for users who wrote within the last few seconds - those fall
+        back to the primary so they never observe replica lag on their
+        own data. Routing keys off the user_id filter in params; tables
+        that filter by another column (e.g. profiles keyed by id) pass
+        the owning user explicitly via the user_id argument.
+        """
+        if user_id is None:
+            user_id = str(params.get('user_id', '')).removeprefix('eq.')
+        if user_id and user_id in _recent_writers:
+            client, headers = self._client, _AUTH_HEADERS
+        else:
+            client, headers = get_read_http_client(), _READ_AUTH_HEADERS
+        response = await client.get(
+            f"{_REST}/{table}", params=params, headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _insert(self, table: str, rows: Any, returning: bool = True) -> List[Dict]:
+        """
+        Insert one row (dict) or many (list of dicts).
+
+        With returning=False PostgREST skips serializing the inserted
+        rows back, which is all fire-and-forget writes need.
+        """
+        headers = dict(_AUTH_HEADERS)
+        headers['Prefer'] = 'return=representation' if returning else 'return=minimal'
+        response = await self._client.post(
+            f"{_REST}/{table}", json=rows, headers=headers
+        )
+        response.raise_for_status()
+        self._mark_writer(rows)
+        return response.json() if returning else []
+
+    async def _update(
+        self,
+        table: str,
+        params: Dict[str, Any],
+        values: Dict,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Run a PostgREST update against the rows matching params.
+
+        As with _select, pass user_id explicitly when the filter column
+        isn't user_id so read-your-writes routing still sees the write.
+        """
+        headers = dict(_AUTH_HEADERS)
+        headers['Prefer'] = 'return=minimal'
+        response = await self._client.patch(
+            f"{_REST}/{table}", params=params, json=values, headers=headers
+        )
+        response.raise_for_status()
+        if user_id is None:
+            user_id = str(params.get('user_id', '')).removeprefix('eq.')
+        self._mark_writer({'user_id': user_id})
+
+    async def _insert_with_retry(self, table: str, row: Dict[str, Any]) -> bool:
+        """
+        Insert one row in the background, retrying transient failures.
+
+        Up to three attempts with exponential backoff; a row that still
+        fails is logged and dropped (callers use this only for writes
+        whose loss is tolerable).
+        """
+        delay = 0.5
+        for attempt in range(3):
+            try:
+                await self._insert(table, row, returning=False)
+                return True
+            except Exception as e:
+                if attempt == 2:
+                    print(f"Error inserting into {table} after 3 attempts: {e}")
+                    return False
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _rpc(self, function: str, args: Dict[str, Any]) -> Any:
+        """Call a Postgres function through PostgREST"""
+        response = await self._client.post(
+            f"{_REST}/rpc/{function}", json=args, headers=_AUTH_HEADERS
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def save_analysis(
+        self,
+        user_id: str,
+        analysis_type: str,
+        document_type: Optional[str],
+        text_preview: str,
+        results: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Save an analysis result for a user.
+
+        Args:
+            user_id: User UUID
+            analysis_type: Type of analysis (text, legal, feedback)
+            document_type: Type of document (optional)
+            text_preview: First part of the analyzed text
+            results: Analysis results as dict
+
+        Returns:
+            Analysis ID if successful, None otherwise
+        """
+        if not self._configured:
+            return None
+
+        try:
+            # completed_at is filled by its column default (now()), so the
+            # row timestamp is the transaction time, not the client clock
+            rows = await self._insert('analyses', {
+                'user_id': user_id,
+                'analysis_type': analysis_type,
+                'document_type': document_type,
+                'text_preview': text_preview,
+                'status': 'completed',
+                'results': jsonable_encoder(results)
+            })
+
+            if rows:
+                return rows[0]['id']
+            return None
+        except Exception as e:
+            print(f"Error saving analysis: {e}")
+            return None
+
+    async def bulk_save_analyses(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Save multiple analyses in a single insert.
+
+        Args:
+            batch: List of analysis rows (same shape as save_analysis args)
+
+        Returns:
+            Number of rows saved
+        """
+        if not self._configured or not batch:
+            return 0
+
+        rows = [
+            {
+                'user_id': item['user_id'],
+                'analysis_type': item['analysis_type'],
+                'document_type': item.get('document_type'),
+                'text_preview': item.get('text_preview', ''),
+                'status': 'completed',
+                'results': jsonable_encoder(item.get('results', {}))
+            }
+            for item in batch
+        ]
+
+        try:
+            saved = await self._insert('analyses', rows)
+            return len(saved)
+        except Exception as e:
+            print(f"Error bulk saving analyses: {e}")
+            return 0
+
+    # ========== SWR CACHE PLUMBING ==========
+
+    async def _swr_get(
+        self,
+        cache: TTLCache,
+        user_id: str,
+        fetch: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve a per-user value through the stale-while-revalidate cache.
+
+        Fresh entries return immediately; stale entries return immediately
+        too, with a background task refreshing them; misses await the fetch.
+        """
+        entry = cache.get(user_id)
+        if entry is not None:
+            value, fetched_at = entry
+            if time.monotonic() - fetched_at >= _SWR_FRESH_TTL:
+                key = (id(cache), user_id)
+                if key not in _swr_refreshing:
+                    _swr_refreshing.add(key)
+                    _spawn(self._swr_refresh(cache, user_id, fetch, key))
+            return value
+
+        value = await fetch(user_id)
+        if value is not None:
+            cache[user_id] = (value, time.monotonic())
+        return value
+
+    async def _swr_refresh(
+        self,
+        cache: TTLCache,
+        user_id: str,
+        fetch: Callable[[str], Awaitable[Any]],
+        key: tuple
+    ) -> None:
+        """Background revalidation of a stale cache entry"""
+        try:
+            value = await fetch(user_id)
+            if value is not None:
+                cache[user_id] = (value, time.monotonic())
+        finally:
+            _swr_refreshing.discard(key)
+
     # ========== PROFILE OPERATIONS ==========
-    
+
     async def get_user_profile(self, user_id: str) -> Optional[Dict]:
         """
-        Get user profile by ID.
-        
+        Get user profile by ID (served through the SWR cache).
+
         Args:
             user_id: User UUID
-            
+
         Returns:
             User profile dict or None
         """
-        if not self.client:
+        if not self._configured:
             return None
-        
+
+        return await self._swr_get(_profile_cache, user_id, self._fetch_user_profile)
+
+    async def _fetch_user_profile(self, user_id: str) -> Optional[Dict]:
+        """Fetch a user profile from Supabase"""
         try:
-            response = self.client.table('profiles').select('*').eq('id', user_id).execute()
-            if response.data and len(response.data) > 0:
-                return response.data[0]
+            rows = await self._select('profiles', {
+                'select': '*',
+                'id': f'eq.{user_id}'
+            }, user_id=user_id)
+            if rows:
+                return rows[0]
             return None
         except Exception as e:
             print(f"Error getting user profile: {e}")
             return None
-    
+
     async def update_user_profile(self, user_id: str, updates: Dict) -> bool:
         """
         Update user profile.
-        
+
         Args:
             user_id: User UUID
             updates: Dictionary of fields to update
-            
+
         Returns:
             True if successful, False otherwise
         """
-        if not self.client:
+        if not self._configured:
             return False
-        
+
         try:
-            self.client.table('profiles').update(updates).eq('id', user_id).execute()
+            await self._update('profiles', {'id': f'eq.{user_id}'}, updates,
+                               user_id=user_id)
+            # Drop the cached profile synchronously so the next read
+            # reflects this write instead of a stale entry
+            _profile_cache.pop(user_id, None)
             return True
         except Exception as e:
             print(f"Error updating user profile: {e}")
             return False
-    
+
     # ========== DOCUMENT OPERATIONS ==========
-    
+
     async def create_document(
         self,
         user_id: str,
@@ -87,7 +395,7 @@ class DatabaseService:
     ) -> Optional[str]:
         """
         Create a document record.
-        
+
         Args:
             user_id: User UUID
             filename: Original filename
@@ -95,15 +403,15 @@ class DatabaseService:
             file_type: MIME type
             file_path: Storage path
             document_type: Type of document
-            
+
         Returns:
             Document ID if successful, None otherwise
         """
-        if not self.client:
+        if not self._configured:
             return None
-        
+
         try:
-            response = self.client.table('documents').insert({
+            rows = await self._insert('documents', {
                 'user_id': user_id,
                 'filename': filename,
                 'file_size': file_size,
@@ -111,50 +419,162 @@ class DatabaseService:
                 'file_path': file_path,
                 'document_type': document_type,
                 'upload_status': 'uploaded'
-            }).execute()
-            
-            if response.data and len(response.data) > 0:
-                return response.data[0]['id']
+            })
+
+            if rows:
+                return rows[0]['id']
             return None
         except Exception as e:
             print(f"Error creating document: {e}")
             return None
-    
+
+    # List views only render metadata; fetching every column would drag
+    # the large JSONB results payloads over the wire for nothing
+    _ANALYSIS_LIST_COLUMNS = (
+        'id,analysis_type,document_type,status,risk_score,risk_level,'
+        'word_count,created_at,document_id'
+    )
+    _DOCUMENT_LIST_COLUMNS = (
+        'id,filename,file_size,file_type,uploaded_at,document_type,upload_status'
+    )
+
+    def create_document_async(
+        self,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        file_type: str,
+        file_path: str,
+        document_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Fire-and-forget variant of create_document.
+
+        The row id is generated client-side and returned immediately;
+        the insert runs as a background task with retries, overlapping
+        the round-trip with the response send. Use create_document when
+        the caller must know the write landed.
+
+        Returns:
+            Document ID (not yet persisted), None if unconfigured
+        """
+        if not self._configured:
+            return None
+
+        document_id = str(uuid.uuid4())
+        _spawn(self._insert_with_retry('documents', {
+            'id': document_id,
+            'user_id': user_id,
+            'filename': filename,
+            'file_size': file_size,
+            'file_type': file_type,
+            'file_path': file_path,
+            'document_type': document_type,
+            'upload_status': 'uploaded'
+        }))
+        return document_id
+
     async def get_user_documents(
         self,
         user_id: str,
         limit: int = 50,
-        offset: int = 0
+        after: Optional[Tuple[str, str]] = None,
+        full: bool = False
     ) -> List[Dict]:
         """
         Get user's documents.
-        
+
+        Pagination is keyset-based: pass the last row's (uploaded_at, id)
+        as `after` to fetch the next page. Unlike OFFSET, which scans and
+        discards every earlier row, this seeks straight to the cursor, so
+        page 100 costs the same as page 1.
+
         Args:
             user_id: User UUID
             limit: Maximum number of documents
-            offset: Offset for pagination
-            
+            after: Cursor from the previous page's last row
+            full: Fetch every column instead of the list projection
+
         Returns:
             List of document dicts
         """
-        if not self.client:
+        if not self._configured:
             return []
-        
+
         try:
-            response = self.client.table('documents')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .order('uploaded_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute()
-            
-            return response.data if response.data else []
+            # Served by documents_user_uploaded_idx (see DEPLOYMENT.md),
+            # so the query is an index scan with no sort step
+            params = {
+                'select': '*' if full else self._DOCUMENT_LIST_COLUMNS,
+                'user_id': f'eq.{user_id}',
+                'order': 'uploaded_at.desc,id.desc',
+                'limit': limit
+            }
+
+            if after is not None:
+                params['or'] = _keyset_filter('uploaded_at', after)
+
+            return await self._select('documents', params)
         except Exception as e:
             print(f"Error getting user documents: {e}")
             return []
-    
+
+    async def get_user_documents_with_analyses(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Get user's documents with their analyses in a single round-trip.
+
+        Fetching documents and then analyses per document is the classic
+        N+1 pattern - 1 + N HTTP calls. This calls a Postgres function
+        that joins both server-side, so the whole shape arrives in one
+        response. The backing function (create once in the Supabase SQL
+        editor):
+
+            create or replace function user_documents_with_analyses(
+                p_user_id uuid, p_limit int default 50, p_offset int default 0
+            ) returns table (document json, analyses json)
+            language sql stable as $$
+                select row_to_json(d),
+                       coalesce(a.items, '[]'::json)
+                from documents d
+                left join lateral (
+                    select json_agg(a) as items
+                    from analyses a where a.document_id = d.id
+                ) a on true
+                where d.user_id = p_user_id
+                order by d.uploaded_at desc
+                limit p_limit offset p_offset
+            $$;
+
+        Args:
+            user_id: User UUID
+            limit: Maximum number of documents
+            offset: Offset for pagination
+
+        Returns:
+            List of {document, analyses} dicts
+        """
+        if not self._configured:
+            return []
+
+        try:
+            data = await self._rpc('user_documents_with_analyses', {
+                'p_user_id': user_id,
+                'p_limit': limit,
+                'p_offset': offset
+            })
+
+            return data if data else []
+        except Exception as e:
+            print(f"Error getting documents with analyses: {e}")
+            return []
+
     # ========== ANALYSIS OPERATIONS ==========
-    
+
     async def create_analysis(
         self,
         user_id: str,
@@ -168,7 +588,7 @@ class DatabaseService:
     ) -> Optional[str]:
         """
         Create an analysis record.
-        
+
         Args:
             user_id: User UUID
             analysis_type: Type of analysis
@@ -178,15 +598,15 @@ class DatabaseService:
             risk_score: Risk score
             risk_level: Risk level
             processing_time_ms: Processing time
-            
+
         Returns:
             Analysis ID if successful, None otherwise
         """
-        if not self.client:
+        if not self._configured:
             return None
-        
+
         try:
-            response = self.client.table('analyses').insert({
+            rows = await self._insert('analyses', {
                 'user_id': user_id,
                 'document_id': document_id,
                 'analysis_type': analysis_type,
@@ -195,112 +615,209 @@ class DatabaseService:
                 'word_count': word_count,
                 'risk_score': risk_score,
                 'risk_level': risk_level,
-                'processing_time_ms': processing_time_ms,
-                'completed_at': datetime.utcnow().isoformat()
-            }).execute()
-            
-            if response.data and len(response.data) > 0:
-                return response.data[0]['id']
+                'processing_time_ms': processing_time_ms
+            })
+
+            if rows:
+                return rows[0]['id']
             return None
         except Exception as e:
             print(f"Error creating analysis: {e}")
             return None
-    
+
+    def create_analysis_async(
+        self,
+        user_id: str,
+        analysis_type: str,
+        results: Dict[str, Any],
+        document_id: Optional[str] = None,
+        word_count: Optional[int] = None,
+        risk_score: Optional[int] = None,
+        risk_level: Optional[str] = None,
+        processing_time_ms: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Fire-and-forget variant of create_analysis.
+
+        Same shape as create_analysis, but the id is generated
+        client-side and the insert happens in a background task with
+        retries - the caller never waits on the Supabase round-trip.
+
+        Returns:
+            Analysis ID (not yet persisted), None if unconfigured
+        """
+        if not self._configured:
+            return None
+
+        analysis_id = str(uuid.uuid4())
+        _spawn(self._insert_with_retry('analyses', {
+            'id': analysis_id,
+            'user_id': user_id,
+            'document_id': document_id,
+            'analysis_type': analysis_type,
+            'status': 'completed',
+            'results': results,
+            'word_count': word_count,
+            'risk_score': risk_score,
+            'risk_level': risk_level,
+            'processing_time_ms': processing_time_ms
+        }))
+        return analysis_id
+
     async def get_user_analyses(
         self,
         user_id: str,
         limit: int = 50,
-        offset: int = 0,
-        analysis_type: Optional[str] = None
+        after: Optional[Tuple[str, str]] = None,
+        analysis_type: Optional[str] = None,
+        full: bool = False
     ) -> List[Dict]:
         """
         Get user's analyses.
-        
+
+        Pagination is keyset-based: pass the last row's (created_at, id)
+        as `after` to fetch the next page (see get_user_documents).
+
         Args:
             user_id: User UUID
             limit: Maximum number of analyses
-            offset: Offset for pagination
+            after: Cursor from the previous page's last row
             analysis_type: Filter by type (optional)
-            
+            full: Fetch every column (including results) instead of the
+                list projection
+
         Returns:
             List of analysis dicts
         """
-        if not self.client:
+        if not self._configured:
             return []
-        
+
         try:
-            query = self.client.table('analyses')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .order('created_at', desc=True)
-            
+            # Served by analyses_user_created_idx / _user_type_created_idx
+            # (see DEPLOYMENT.md), so paging never sorts the full set
+            params = {
+                'select': '*' if full else self._ANALYSIS_LIST_COLUMNS,
+                'user_id': f'eq.{user_id}',
+                'order': 'created_at.desc,id.desc',
+                'limit': limit
+            }
+
             if analysis_type:
-                query = query.eq('analysis_type', analysis_type)
-            
-            response = query.range(offset, offset + limit - 1).execute()
-            
-            return response.data if response.data else []
+                params['analysis_type'] = f'eq.{analysis_type}'
+
+            if after is not None:
+                params['or'] = _keyset_filter('created_at', after)
+
+            return await self._select('analyses', params)
         except Exception as e:
             print(f"Error getting user analyses: {e}")
             return []
-    
+
+    async def get_user_history(self, user_id: str, limit: int = 10) -> List[Dict]:
+        """
+        Get a user's most recent analyses (history view).
+
+        Args:
+            user_id: User UUID
+            limit: Maximum number of records
+
+        Returns:
+            List of analysis dicts, newest first
+        """
+        return await self.get_user_analyses(user_id=user_id, limit=limit)
+
     async def get_analysis_by_id(self, analysis_id: str, user_id: str) -> Optional[Dict]:
         """
         Get specific analysis by ID.
-        
+
         Args:
             analysis_id: Analysis UUID
             user_id: User UUID (for authorization)
-            
+
         Returns:
             Analysis dict or None
         """
-        if not self.client:
+        if not self._configured:
             return None
-        
+
         try:
-            response = self.client.table('analyses')\
-                .select('*')\
-                .eq('id', analysis_id)\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            if response.data and len(response.data) > 0:
-                return response.data[0]
+            rows = await self._select('analyses', {
+                'select': '*',
+                'id': f'eq.{analysis_id}',
+                'user_id': f'eq.{user_id}'
+            })
+
+            if rows:
+                return rows[0]
             return None
         except Exception as e:
             print(f"Error getting analysis: {e}")
             return None
-    
+
+    # ========== DASHBOARD ==========
+
+    async def get_dashboard(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get everything a dashboard view needs in one call.
+
+        The four reads are independent, so they are issued concurrently
+        with asyncio.gather - total latency tracks the slowest fetch
+        rather than the sum of all four. Profile and statistics usually
+        resolve from the SWR cache without touching the network at all.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Dict with profile, documents, analyses and statistics keys
+        """
+        profile, documents, analyses, statistics = await asyncio.gather(
+            self.get_user_profile(user_id),
+            self.get_user_documents(user_id),
+            self.get_user_analyses(user_id),
+            self.get_user_statistics(user_id)
+        )
+
+        return {
+            'profile': profile,
+            'documents': documents,
+            'analyses': analyses,
+            'statistics': statistics
+        }
+
     # ========== STATISTICS ==========
-    
+
     async def get_user_statistics(self, user_id: str) -> Dict[str, Any]:
         """
-        Get user statistics.
-        
+        Get user statistics (served through the SWR cache).
+
         Args:
             user_id: User UUID
-            
+
         Returns:
             Statistics dict
         """
-        if not self.client:
+        if not self._configured:
             return {
                 'total_documents': 0,
                 'total_analyses': 0,
                 'avg_risk_score': 0,
                 'total_processing_time_ms': 0
             }
-        
+
+        return await self._swr_get(_stats_cache, user_id, self._fetch_user_statistics)
+
+    async def _fetch_user_statistics(self, user_id: str) -> Dict[str, Any]:
+        """Fetch user statistics from Supabase"""
         try:
-            response = self.client.table('user_statistics')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            if response.data and len(response.data) > 0:
-                return response.data[0]
-            
+            rows = await self._select('user_statistics', {
+                'select': '*',
+                'user_id': f'eq.{user_id}'
+            })
+
+            if rows:
+                return rows[0]
+
             return {
                 'total_documents': 0,
                 'total_analyses': 0,
@@ -315,9 +832,58 @@ class DatabaseService:
                 'avg_risk_score': 0,
                 'total_processing_time_ms': 0
             }
-    
+
+    async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get aggregate analysis statistics for a user.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Stats dict matching the UserStats schema
+        """
+        stats = {
+            'total_analyses': 0,
+            'text_analyses': 0,
+            'legal_analyses': 0,
+            'feedback_analyses': 0,
+            'total_documents_processed': 0,
+            'average_document_length': 0.0,
+            'last_analysis_date': None
+        }
+
+        if not self._configured:
+            return stats
+
+        try:
+            rows = await self._select('analyses', {
+                'select': 'analysis_type,word_count,created_at',
+                'user_id': f'eq.{user_id}'
+            })
+
+            stats['total_analyses'] = len(rows)
+            stats['total_documents_processed'] = len(rows)
+
+            for row in rows:
+                key = f"{row.get('analysis_type')}_analyses"
+                if key in stats:
+                    stats[key] += 1
+
+            lengths = [row['word_count'] for row in rows if row.get('word_count')]
+            if lengths:
+                stats['average_document_length'] = round(sum(lengths) / len(lengths), 2)
+
+            dates = [row['created_at'] for row in rows if row.get('created_at')]
+            if dates:
+                stats['last_analysis_date'] = max(dates)
+        except Exception as e:
+            print(f"Error getting user stats: {e}")
+
+        return stats
+
     # ========== API USAGE TRACKING ==========
-    
+
     async def log_api_usage(
         self,
         user_id: str,
@@ -329,7 +895,11 @@ class DatabaseService:
     ) -> bool:
         """
         Log API usage.
-        
+
+        The row is queued for the background flusher rather than written
+        inline, so request handlers never pay a network round-trip for
+        telemetry - a hundred requests become one multi-row insert.
+
         Args:
             user_id: User UUID
             endpoint: API endpoint
@@ -337,27 +907,41 @@ class DatabaseService:
             tokens_used: Number of tokens used
             response_time_ms: Response time
             status_code: HTTP status code
-            
+
         Returns:
-            True if successful, False otherwise
+            True if queued, False otherwise
         """
-        if not self.client:
-            return False
-        
-        try:
-            self.client.table('api_usage').insert({
-                'user_id': user_id,
-                'endpoint': endpoint,
-                'method': method,
-                'tokens_used': tokens_used,
-                'response_time_ms': response_time_ms,
-                'status_code': status_code
-            }).execute()
-            return True
-        except Exception as e:
-            print(f"Error logging API usage: {e}")
+        if not self._configured:
             return False
 
+        # Imported here: save_queue imports this module at load time
+        from app.services.save_queue import usage_queue
+
+        return usage_queue.enqueue({
+            'user_id': user_id,
+            'endpoint': endpoint,
+            'method': method,
+            'tokens_used': tokens_used,
+            'response_time_ms': response_time_ms,
+            'status_code': status_code
+        })
+
+    async def bulk_log_api_usage(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Insert multiple api_usage rows in one call.
+
+        Args:
+            batch: List of usage rows (same shape as log_api_usage args)
+
+        Returns:
+            Number of rows saved
+        """
+        if not self._configured or not batch:
+            return 0
 
-# Create service instance
-db_service = DatabaseService()
\ No newline at end of file
+        try:
+            await self._insert('api_usage', batch, returning=False)
+            return len(batch)
+        except Exception as e:
+            print(f"Error bulk logging API usage: {e}")
+            return 0
@@ -0,0 +1,133 @@
+"""
+Save Queue - Batched background persistence of write-heavy rows
+Coalesces individual saves into bulk Supabase inserts (group commit)
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from app.services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+# Batching parameters: a full batch or a short wait triggers a flush
+BATCH_MAX = 64
+BATCH_TIMEOUT_MS = 25
+
+
+class SaveQueue:
+    """
+    Background queue that batches analysis saves into bulk inserts.
+
+    Handlers enqueue pending saves without blocking; a single worker
+    drains the queue and writes up to BATCH_MAX rows per Supabase call,
+    amortizing the network round trip across many analyses.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        flush_method: str = "bulk_save_analyses",
+        description: str = "analyses"
+    ):
+        """
+        Initialize the save queue.
+
+        Args:
+            maxsize: Maximum number of pending saves before enqueues are dropped
+            flush_method: Name of the DatabaseService bulk-insert method
+            description: What the rows are, for log messages
+        """
+        self.database: Optional[DatabaseService] = None
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self._worker_task: Optional[asyncio.Task] = None
+        self._flush_method = flush_method
+        self._description = description
+
+    def start(self, database: DatabaseService) -> None:
+        """Start the background worker (called from the app lifespan)"""
+        self.database = database
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self._save_worker())
+
+    async def stop(self) -> None:
+        """Stop the worker, flushing anything still queued"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        # Flush whatever is left so shutdown doesn't lose saves
+        remaining = self._drain(BATCH_MAX * 16)
+        if remaining:
+            await self._flush(remaining)
+
+    def enqueue(self, item: Dict[str, Any]) -> bool:
+        """
+        Queue an analysis save without blocking.
+
+        Args:
+            item: Row data for the target table
+
+        Returns:
+            True if queued, False if the queue is full (save dropped)
+        """
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Save queue full - dropping {self._description} save")
+            return False
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        """Drain up to `limit` items currently in the queue without waiting"""
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Write one batch, logging (not raising) on failure"""
+        if self.database is None:
+            logger.warning("Save queue flushed before start - dropping batch")
+            return
+        try:
+            saved = await getattr(self.database, self._flush_method)(batch)
+            logger.info(f"Saved batch of {saved} {self._description}")
+        except Exception as e:
+            logger.warning(f"Failed to save {self._description} batch: {e}")
+
+    async def _save_worker(self) -> None:
+        """Worker loop: wait for one item, briefly gather more, bulk insert"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+
+            # Give a short window for more saves to arrive so bursts
+            # collapse into one insert
+            deadline = loop.time() + (BATCH_TIMEOUT_MS / 1000)
+            while len(batch) < BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch.extend(self._drain(BATCH_MAX - len(batch)))
+            await self._flush(batch)
+
+
+# Shared queue instances; bound to the database service at startup.
+# API usage rows are pure telemetry, so they get their own queue and a
+# single multi-row insert per batch instead of one insert per request.
+save_queue = SaveQueue()
+usage_queue = SaveQueue(flush_method="bulk_log_api_usage", description="api usage rows")
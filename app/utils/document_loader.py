@@ -3,26 +3,85 @@ Document Loader - Extract text from various document formats
 Supports: .txt, .pdf, .docx, .doc
 """
 
-from typing import Optional
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
 import io
 import logging
+import mmap
+import os
+import threading
+import zipfile
 from pathlib import Path
 
+from cachetools import TTLCache
+from charset_normalizer import from_bytes as _sniff_encoding
+from lxml import etree
+
 # Document processing imports
-from docx import Document
 import PyPDF2
 import pdfplumber
 
 logger = logging.getLogger(__name__)
 
+# Page-layout analysis is CPU-bound, so multi-page PDFs are fanned out
+# across worker processes (created lazily, shared for the process life).
+# Small PDFs stay on the serial path - fork overhead would dominate.
+_PDF_PARALLEL_MIN_PAGES = 3
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+# Re-uploads of the same file (retries, analyzing one upload through
+# several endpoints) skip parsing entirely: extracted text is cached by
+# content digest for ten minutes. Only PDF/DOCX parses are cached -
+# decoding a .txt is cheaper than hashing it would be worthwhile for.
+_extract_cache: TTLCache = TTLCache(maxsize=128, ttl=600)
+_extract_cache_lock = threading.Lock()
+
+# WordprocessingML tags matched while streaming word/document.xml
+_DOCX_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W_T = f'{{{_DOCX_NS}}}t'
+_W_P = f'{{{_DOCX_NS}}}p'
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Get the shared PDF page-extraction pool, creating it if needed"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _pdf_pool
+
+
+def _extract_pdf_page(source, page_index: int) -> Optional[str]:
+    """
+    Extract one page's text (runs in a pool worker process).
+
+    `source` is either raw PDF bytes or a filesystem path; passing the
+    path for on-disk files means workers reopen it themselves instead of
+    pickling megabytes of bytes per task.
+    """
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    with pdfplumber.open(stream) as pdf:
+        page = pdf.pages[page_index]
+        # Retrying with tighter tolerances often recovers text from PDFs
+        # whose default-layout extraction comes back empty
+        return page.extract_text() or page.extract_text(x_tolerance=1, y_tolerance=1)
+
 
 class DocumentLoader:
     """
     Utility class for loading and extracting text from various document formats.
     """
     
-    SUPPORTED_EXTENSIONS = ['.txt', '.pdf', '.docx', '.doc']
+    SUPPORTED_EXTENSIONS = frozenset({'.txt', '.pdf', '.docx', '.doc'})
     MAX_FILE_SIZE_MB = 10
+    MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _ext(filename: str) -> str:
+        """Normalized extension for a filename (cached - hot on batches)"""
+        return Path(filename).suffix.lower()
     
     @staticmethod
     def is_supported(filename: str) -> bool:
@@ -35,8 +94,7 @@ class DocumentLoader:
         Returns:
             bool: True if supported
         """
-        ext = Path(filename).suffix.lower()
-        return ext in DocumentLoader.SUPPORTED_EXTENSIONS
+        return DocumentLoader._ext(filename) in DocumentLoader.SUPPORTED_EXTENSIONS
     
     @staticmethod
     def validate_file_size(file_size: int) -> bool:
@@ -49,8 +107,7 @@ class DocumentLoader:
         Returns:
             bool: True if valid
         """
-        max_bytes = DocumentLoader.MAX_FILE_SIZE_MB * 1024 * 1024
-        return file_size <= max_bytes
+        return file_size <= DocumentLoader.MAX_FILE_SIZE_BYTES
     
     @staticmethod
     def load_from_file(file_path: str) -> str:
@@ -77,7 +134,7 @@ class DocumentLoader:
             raise ValueError(f"File too large. Maximum size: {DocumentLoader.MAX_FILE_SIZE_MB}MB")
         
         # Load based on extension
-        ext = path.suffix.lower()
+        ext = DocumentLoader._ext(path.name)
         
         try:
             if ext == '.txt':
@@ -113,17 +170,30 @@ class DocumentLoader:
             raise ValueError(f"File too large. Maximum size: {DocumentLoader.MAX_FILE_SIZE_MB}MB")
         
         # Load based on extension
-        ext = Path(filename).suffix.lower()
+        ext = DocumentLoader._ext(filename)
         
         try:
             if ext == '.txt':
                 return DocumentLoader._load_txt_from_bytes(file_bytes)
-            elif ext == '.pdf':
-                return DocumentLoader._load_pdf_from_bytes(file_bytes)
+
+            # blake2b hashes the payload far faster than a parse; a hit
+            # returns the extracted text without decoding a single page
+            key = hashlib.blake2b(file_bytes, digest_size=16).digest()
+            with _extract_cache_lock:
+                cached = _extract_cache.get(key)
+            if cached is not None:
+                return cached
+
+            if ext == '.pdf':
+                text = DocumentLoader._load_pdf_from_bytes(file_bytes)
             elif ext in ['.docx', '.doc']:
-                return DocumentLoader._load_docx_from_bytes(file_bytes)
+                text = DocumentLoader._load_docx_from_bytes(file_bytes)
             else:
                 raise ValueError(f"Unsupported extension: {ext}")
+
+            with _extract_cache_lock:
+                _extract_cache[key] = text
+            return text
         
         except Exception as e:
             logger.error(f"Error loading file {filename}: {str(e)}")
@@ -134,70 +204,125 @@ class DocumentLoader:
     @staticmethod
     def _load_txt(file_path: Path) -> str:
         """Load text from .txt file"""
+        # Decode straight out of the OS page cache via mmap - no
+        # intermediate bytes copy, and repeat loads of the same file are
+        # served from memory
+        with open(file_path, 'rb') as f:
+            if file_path.stat().st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return DocumentLoader._decode_text(mm)
+    
+    @staticmethod
+    def _decode_text(data) -> str:
+        """
+        Decode a text buffer (bytes or mmap), sniffing the encoding.
+
+        A BOM dispatches straight to the right decoder; otherwise UTF-8
+        is tried once, and only genuinely non-UTF-8 input pays for
+        charset detection. The old blind latin-1 fallback silently
+        mangled anything that wasn't Latin text; it remains only as the
+        lossless last resort when detection gives up.
+        """
+        head = bytes(data[:3])
+        if head == b'\xef\xbb\xbf':
+            return str(data, 'utf-8-sig')
+        if head[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            return str(data, 'utf-16')
+
         try:
-            # Try UTF-8 first
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return str(data, 'utf-8')
         except UnicodeDecodeError:
-            # Fallback to latin-1
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
-    
+            best = _sniff_encoding(bytes(data)).best()
+            if best is not None:
+                return str(best)
+            return str(data, 'latin-1')
+
     @staticmethod
     def _load_txt_from_bytes(file_bytes: bytes) -> str:
         """Load text from .txt bytes"""
-        try:
-            # Try UTF-8 first
-            return file_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            # Fallback to latin-1
-            return file_bytes.decode('latin-1')
+        return DocumentLoader._decode_text(file_bytes)
     
     # ==================== PDF LOADERS ====================
     
     @staticmethod
     def _load_pdf(file_path: Path) -> str:
         """Load text from PDF file using pdfplumber (better extraction)"""
-        text_parts = []
-        
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            
-            if not text_parts:
-                # Fallback to PyPDF2 if pdfplumber fails
-                return DocumentLoader._load_pdf_pypdf2(file_path)
-            
-            return '\n\n'.join(text_parts)
-        
+            # Pass the path, not the bytes: pdfplumber streams from disk
+            # and pool workers reopen the file themselves
+            text_parts = DocumentLoader._extract_pdf_pages(str(file_path))
         except Exception as e:
             logger.warning(f"pdfplumber failed, trying PyPDF2: {str(e)}")
             return DocumentLoader._load_pdf_pypdf2(file_path)
+        
+        if not text_parts:
+            raise ValueError("Could not extract text from PDF")
+        
+        return '\n\n'.join(text_parts)
     
     @staticmethod
     def _load_pdf_from_bytes(file_bytes: bytes) -> str:
         """Load text from PDF bytes using pdfplumber"""
-        text_parts = []
-        
         try:
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            
-            if not text_parts:
-                # Fallback to PyPDF2
-                return DocumentLoader._load_pdf_pypdf2_from_bytes(file_bytes)
-            
-            return '\n\n'.join(text_parts)
-        
+            text_parts = DocumentLoader._extract_pdf_pages(file_bytes)
         except Exception as e:
             logger.warning(f"pdfplumber failed, trying PyPDF2: {str(e)}")
             return DocumentLoader._load_pdf_pypdf2_from_bytes(file_bytes)
+        
+        if not text_parts:
+            raise ValueError("Could not extract text from PDF")
+        
+        return '\n\n'.join(text_parts)
+
+    @staticmethod
+    def _extract_pdf_pages(source) -> List[str]:
+        """
+        Extract text from every PDF page, in page order.
+
+        `source` is raw PDF bytes or a filesystem path. Multi-page
+        documents run one task per page on the process pool, so wall
+        time approaches the slowest page rather than the sum.
+        """
+        stream = io.BytesIO(source) if isinstance(source, bytes) else source
+        with pdfplumber.open(stream) as pdf:
+            page_count = len(pdf.pages)
+            if page_count < _PDF_PARALLEL_MIN_PAGES:
+                texts = [
+                    page.extract_text()
+                    or page.extract_text(x_tolerance=1, y_tolerance=1)
+                    for page in pdf.pages
+                ]
+                return DocumentLoader._fill_empty_pages(source, texts)
+
+        pool = _get_pdf_pool()
+        texts = list(pool.map(
+            _extract_pdf_page,
+            [source] * page_count,
+            range(page_count)
+        ))
+        return DocumentLoader._fill_empty_pages(source, texts)
+
+    @staticmethod
+    def _fill_empty_pages(source, texts: List[Optional[str]]) -> List[str]:
+        """
+        Recover pages pdfplumber couldn't read with one shared PyPDF2
+        reader, opened lazily only if some page actually came up empty -
+        the whole document is never parsed twice for a few bad pages.
+        """
+        reader = None
+        for index, text in enumerate(texts):
+            if text:
+                continue
+            if reader is None:
+                stream = io.BytesIO(source) if isinstance(source, bytes) else source
+                reader = PyPDF2.PdfReader(stream)
+            try:
+                texts[index] = reader.pages[index].extract_text()
+            except Exception:
+                continue
+
+        return [text for text in texts if text]
     
     @staticmethod
     def _load_pdf_pypdf2(file_path: Path) -> str:
@@ -237,47 +362,53 @@ class DocumentLoader:
     @staticmethod
     def _load_docx(file_path: Path) -> str:
         """Load text from .docx file"""
-        doc = Document(file_path)
-        text_parts = []
-        
-        # Extract paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
-        # Extract tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        
-        if not text_parts:
-            raise ValueError("No text content found in document")
-        
-        return '\n\n'.join(text_parts)
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open('word/document.xml') as xml:
+                return DocumentLoader._extract_docx_text(xml)
     
     @staticmethod
     def _load_docx_from_bytes(file_bytes: bytes) -> str:
         """Load text from .docx bytes"""
-        doc = Document(io.BytesIO(file_bytes))
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            with archive.open('word/document.xml') as xml:
+                return DocumentLoader._extract_docx_text(xml)
+
+    @staticmethod
+    def _extract_docx_text(xml_source) -> str:
+        """
+        Stream paragraph text out of word/document.xml.
+
+        iterparse walks the XML once, in document order, and each
+        finished paragraph subtree is dropped immediately, so memory
+        stays flat no matter how large the document is - no python-docx
+        object tree is ever built and nothing is traversed twice.
+        Table cell paragraphs arrive in reading order like any other,
+        and w:t runs are joined per paragraph in a single ''.join.
+        """
         text_parts = []
-        
-        # Extract paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
-        # Extract tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        
+        runs = []
+
+        for _, elem in etree.iterparse(xml_source, events=('end',), tag=(_W_T, _W_P)):
+            if elem.tag == _W_T:
+                if elem.text:
+                    runs.append(elem.text)
+                continue
+
+            paragraph = ''.join(runs)
+            runs.clear()
+            if paragraph.strip():
+                text_parts.append(paragraph)
+
+            # Free the finished paragraph and any siblings before it
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
         if not text_parts:
             raise ValueError("No text content found in document")
-        
+
         return '\n\n'.join(text_parts)
     
     @staticmethod
@@ -292,7 +423,7 @@ class DocumentLoader:
         Returns:
             dict: File information
         """
-        ext = Path(filename).suffix.lower()
+        ext = DocumentLoader._ext(filename)
         
         return {
             'filename': filename,
@@ -300,5 +431,5 @@ class DocumentLoader:
             'size_bytes': file_size,
             'size_mb': round(file_size / (1024 * 1024), 2),
             'is_supported': ext in DocumentLoader.SUPPORTED_EXTENSIONS,
-            'is_valid_size': file_size <= (DocumentLoader.MAX_FILE_SIZE_MB * 1024 * 1024)
+            'is_valid_size': file_size <= DocumentLoader.MAX_FILE_SIZE_BYTES
         }
\ No newline at end of file
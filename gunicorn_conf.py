@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration - production process model
+
+Analysis work is CPU-bound (regex sweeps, tokenization), so a single
+process bottlenecks on the GIL under concurrent load. Running one
+Uvicorn worker per core (2*cores+1 by the usual rule of thumb) scales
+analysis throughput with the machine. Start with:
+
+    gunicorn app.main:app -c gunicorn_conf.py
+
+Note: the in-process caches (token cache, analysis caches) are
+per-worker; expect one warm-up per process.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Heartbeat files live in shared memory, not on disk
+worker_tmp_dir = "/dev/shm"
+
+# Recycle workers periodically to bound any slow memory growth
+max_requests = 10_000
+max_requests_jitter = 1_000
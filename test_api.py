@@ -1,26 +1,46 @@
 """
 Simple API test script
 Tests the local development server
+
+The endpoint tests are independent, so they are issued concurrently
+over one HTTP/2 connection - total wall-clock time tracks the slowest
+endpoint instead of the sum of all of them. Results still print in a
+fixed order.
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 from pathlib import Path
 
 BASE_URL = "http://localhost:8000/api/v1"
 
+# Payloads are serialized once at import with orjson (C-level encoder)
+# and posted as raw bytes with a preset content type
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+TEXT_PAYLOAD = orjson.dumps({
+    "text": "SmartDoc AI is an innovative platform for South African businesses. It helps companies analyze legal documents quickly and accurately. Businesses in Johannesburg, Pretoria, and Cape Town are using this technology successfully.",
+    "analysis_type": "text"
+})
+
+FEEDBACK_PAYLOAD = orjson.dumps({
+    "text": "The legal document analysis was incredibly helpful and accurate. It identified all the key terms, parties, and risks in seconds. However, the interface could be more intuitive. Overall, I'm very impressed with the technology and would recommend it to other law firms.",
+    "source": "customer_review"
+})
+
 
-def print_result(title: str, response: requests.Response):
+def print_result(title: str, response: httpx.Response):
     """Print formatted response"""
     print("\n" + "=" * 60)
     print(f"📋 {title}")
     print("=" * 60)
     print(f"Status Code: {response.status_code}")
-    
+
     try:
-        response_json = response.json()
+        response_json = orjson.loads(response.content)
         print(f"\nResponse:")
-        
+
         if response.status_code == 200:
             # Success - show main fields
             if "document_info" in response_json:
@@ -44,134 +64,110 @@ def print_result(title: str, response: requests.Response):
                 print(f"Word Count: {stats['word_count']}")
                 print(f"Sentence Count: {stats['sentence_count']}")
         else:
-            print(json.dumps(response_json, indent=2))
+            print(orjson.dumps(response_json, option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
         print(f"Error: {e}")
 
 
-def test_health():
+async def test_health(client: httpx.AsyncClient):
     """Test health endpoint"""
-    response = requests.get(f"{BASE_URL}/health")
-    print_result("Health Check", response)
+    response = await client.get("/health")
+    return "Health Check", response
 
 
-def test_text_analysis():
+async def test_text_analysis(client: httpx.AsyncClient):
     """Test text analysis"""
-    data = {
-        "text": "SmartDoc AI is an innovative platform for South African businesses. It helps companies analyze legal documents quickly and accurately. Businesses in Johannesburg, Pretoria, and Cape Town are using this technology successfully.",
-        "analysis_type": "text"
-    }
-    response = requests.post(f"{BASE_URL}/analyze/text", json=data)
-    print_result("Text Analysis", response)
+    response = await client.post("/analyze/text", content=TEXT_PAYLOAD,
+                                 headers=JSON_HEADERS)
+    return "Text Analysis", response
 
 
-def test_feedback_analysis():
+async def test_feedback_analysis(client: httpx.AsyncClient):
     """Test feedback analysis"""
-    data = {
-        "text": "The legal document analysis was incredibly helpful and accurate. It identified all the key terms, parties, and risks in seconds. However, the interface could be more intuitive. Overall, I'm very impressed with the technology and would recommend it to other law firms.",
-        "source": "customer_review"
-    }
-    response = requests.post(f"{BASE_URL}/analyze/feedback", json=data)
-    print_result("Feedback Analysis", response)
+    response = await client.post("/analyze/feedback", content=FEEDBACK_PAYLOAD,
+                                 headers=JSON_HEADERS)
+    return "Feedback Analysis", response
 
 
-def test_legal_analysis():
-    """Test legal analysis with employment contract"""
-    sample_file = Path("sample_data/employment_contract.txt")
-    
+async def _test_legal_document(client: httpx.AsyncClient, title: str,
+                               filename: str, document_type: str):
+    """Run one legal analysis test against a sample document"""
+    sample_file = Path(f"sample_data/{filename}")
+
     if not sample_file.exists():
-        print(f"\n❌ Sample file not found: {sample_file}")
-        return
-    
-    try:
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        data = {
-            "text": text,
-            "document_type": "employment_contract"
-        }
-        
-        response = requests.post(f"{BASE_URL}/analyze/legal", json=data)
-        print_result("Legal Document Analysis - Employment Contract", response)
-        
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
+        print(f"\n⚠️ Sample file not found, skipping: {sample_file}")
+        return None
+
+    with open(sample_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    payload = orjson.dumps({
+        "text": text,
+        "document_type": document_type
+    })
+
+    response = await client.post("/analyze/legal", content=payload,
+                                 headers=JSON_HEADERS)
+    return title, response
+
+
+async def test_legal_analysis(client: httpx.AsyncClient):
+    """Test legal analysis with employment contract"""
+    return await _test_legal_document(
+        client, "Legal Document Analysis - Employment Contract",
+        "employment_contract.txt", "employment_contract"
+    )
 
 
-def test_legal_lease():
+async def test_legal_lease(client: httpx.AsyncClient):
     """Test legal analysis with lease agreement"""
-    sample_file = Path("sample_data/lease_agreement.txt")
-    
-    if not sample_file.exists():
-        print(f"\n⚠️ Lease agreement file not found, skipping...")
-        return
-    
-    try:
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        data = {
-            "text": text,
-            "document_type": "lease_agreement"
-        }
-        
-        response = requests.post(f"{BASE_URL}/analyze/legal", json=data)
-        print_result("Legal Document Analysis - Lease Agreement", response)
-        
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
+    return await _test_legal_document(
+        client, "Legal Document Analysis - Lease Agreement",
+        "lease_agreement.txt", "lease_agreement"
+    )
 
 
-def test_legal_nda():
+async def test_legal_nda(client: httpx.AsyncClient):
     """Test legal analysis with NDA"""
-    sample_file = Path("sample_data/nda_agreement.txt")
-    
-    if not sample_file.exists():
-        print(f"\n⚠️ NDA file not found, skipping...")
-        return
-    
-    try:
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        data = {
-            "text": text,
-            "document_type": "nda"
-        }
-        
-        response = requests.post(f"{BASE_URL}/analyze/legal", json=data)
-        print_result("Legal Document Analysis - NDA", response)
-        
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
+    return await _test_legal_document(
+        client, "Legal Document Analysis - NDA",
+        "nda_agreement.txt", "nda"
+    )
 
 
-if __name__ == "__main__":
+async def main():
     print("\n🧪 SmartDoc AI - Comprehensive API Tests")
     print("=" * 60)
     print("Testing all endpoints...")
     print("=" * 60)
-    
+
+    # One client, one connection: HTTP/2 multiplexes the concurrent
+    # requests instead of opening a socket per test
+    async with httpx.AsyncClient(base_url=BASE_URL, http2=True, timeout=60) as client:
+        results = await asyncio.gather(
+            test_health(client),
+            test_text_analysis(client),
+            test_feedback_analysis(client),
+            test_legal_analysis(client),
+            test_legal_lease(client),
+            test_legal_nda(client),
+        )
+
+    # gather preserves submission order, so the report stays deterministic
+    for result in results:
+        if result is not None:
+            print_result(*result)
+
+    print("\n" + "=" * 60)
+    print("✅ All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
     try:
-        test_health()
-        test_text_analysis()
-        test_feedback_analysis()
-        
-        print("\n" + "=" * 60)
-        print("📄 Testing Legal Documents")
-        print("=" * 60)
-        
-        test_legal_analysis()
-        test_legal_lease()
-        test_legal_nda()
-        
-        print("\n" + "=" * 60)
-        print("✅ All tests completed!")
-        print("=" * 60)
-    
-    except requests.exceptions.ConnectionError:
+        asyncio.run(main())
+    except httpx.ConnectError:
         print("\n❌ ERROR: Could not connect to server")
         print("Make sure the server is running: python run.py")
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
\ No newline at end of file
+        print(f"\n❌ ERROR: {str(e)}")
@@ -0,0 +1,79 @@
+"""
+model_construct / model_validate parity tests
+
+The analysis services build response models with model_construct, which
+skips every validator on the assumption that the analyzers' own output
+already fits the schemas. These tests keep that assumption honest: for
+each model we round-trip real (or representative) payloads through both
+constructors and assert identical dumps, so any drift between what the
+analyzers produce and what the schemas validate fails here instead of
+silently shipping unvalidated data.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.models.schemas import (
+    Party, DateInfo, MonetaryAmount,
+    TextAnalysisResponse, LegalAnalysisResponse, FeedbackAnalysisResponse
+)
+from app.services.analysis_service import AnalysisService
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_data"
+
+FEEDBACK_TEXT = (
+    "The legal document analysis was incredibly helpful and accurate. "
+    "It identified all the key terms, parties, and risks in seconds. "
+    "However, the interface could be more intuitive."
+)
+
+
+def assert_parity(model_cls, payload: dict):
+    """model_construct and model_validate must agree on trusted input"""
+    constructed = model_cls.model_construct(**payload).model_dump(mode="json")
+    validated = model_cls.model_validate(payload).model_dump(mode="json")
+    assert constructed == validated
+
+
+@pytest.mark.parametrize("model_cls,payload", [
+    (Party, {"name": "TechCorp (Pty) Ltd", "type": "company", "role": "employer"}),
+    (DateInfo, {"date": "1 March 2024", "format": "written", "context": "commencement date"}),
+    (MonetaryAmount, {"amount": "R50,000", "currency": "ZAR", "context": "monthly salary"}),
+])
+def test_leaf_models(model_cls, payload):
+    assert_parity(model_cls, payload)
+
+
+def test_text_analysis_response():
+    result = AnalysisService.analyze_text(FEEDBACK_TEXT)
+    response = TextAnalysisResponse.model_construct(
+        success=True, message="Text analysis completed successfully", **result
+    )
+    payload = response.model_dump(mode="json")
+    assert_parity(TextAnalysisResponse, payload)
+
+
+def test_legal_analysis_response():
+    text = (SAMPLE_DIR / "employment_contract.txt").read_text(encoding="utf-8")
+    result = AnalysisService.analyze_legal_document(
+        text=text, document_type="employment_contract"
+    )
+    response = LegalAnalysisResponse.model_construct(
+        success=True, message="Legal analysis completed successfully", **result
+    )
+    payload = response.model_dump(mode="json")
+    assert_parity(LegalAnalysisResponse, payload)
+
+    # The extracted entities really exercised the leaf models
+    assert payload["parties"]
+    assert payload["monetary_amounts"]
+
+
+def test_feedback_analysis_response():
+    result = AnalysisService.analyze_feedback(FEEDBACK_TEXT)
+    response = FeedbackAnalysisResponse.model_construct(
+        success=True, message="Feedback analysis completed successfully", **result
+    )
+    payload = response.model_dump(mode="json")
+    assert_parity(FeedbackAnalysisResponse, payload)